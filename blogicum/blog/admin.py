@@ -1,10 +1,69 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
 
-from .models import Category, Location, Post
+from .bulk import bulk_update_posts, delete_comments
+from .forms import BulkCategoryForm, BulkLocationForm
+from .models import Category, Comment, Location, Post
+from .search import full_text_search
 
+from constants.constants import (ADMIN_COUNT_CACHE_TIMEOUT,
+                                 ADMIN_ESTIMATED_COUNT_THRESHOLD)
 
-class PostAdmin(admin.ModelAdmin):
-    search_fields = ("text",)
+
+def estimate_count(model):
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE relname = %s",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    # Других оценок нет: полный COUNT(*) считаем не чаще раза в
+    # ADMIN_COUNT_CACHE_TIMEOUT, а между пересчётами отдаём сохранённый.
+    return cache.get_or_set(
+        f"admin:count:{model._meta.label_lower}",
+        model._default_manager.count,
+        ADMIN_COUNT_CACHE_TIMEOUT,
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        model = self.object_list.model
+        # Без фильтров, кроме условий менеджера по умолчанию.
+        if (self.object_list.query.where
+                == model._default_manager.all().query.where):
+            estimate = estimate_count(model)
+            if estimate > ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class PerformanceAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term.strip():
+            found = full_text_search(queryset, search_term)
+            if found is not None:
+                return found, False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class PostAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    search_fields = ("title", "text")
+    list_select_related = ("author", "category", "location")
+    date_hierarchy = "pub_date"
+    raw_id_fields = ("author",)
     list_display = (
         "id",
         "title",
@@ -20,11 +79,116 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = ("category", "is_published", "location")
     list_filter = ("created_at",)
     empty_value_display = "Не задано"
+    actions = ("publish", "unpublish", "recategorize", "relocate")
+
+    def bulk_update(self, request, queryset, **changes):
+        updated = bulk_update_posts(queryset, **changes)
+        self.message_user(request, f"Изменено публикаций: {updated}")
+
+    def bulk_change_form(self, request, queryset, form_class, action):
+        if "apply" in request.POST:
+            form = form_class(request.POST)
+            if form.is_valid():
+                return self.bulk_update(request, queryset,
+                                        **form.cleaned_data)
+        else:
+            form = form_class()
+        return TemplateResponse(request, "admin/blog/post/bulk_change.html", {
+            **self.admin_site.each_context(request),
+            "title": self.get_action(action)[2],
+            "opts": self.model._meta,
+            "form": form,
+            "action": action,
+            "count": queryset.count(),
+            "select_across": request.POST.get("select_across") == "1",
+            "selected": request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+        })
+
+    @admin.action(description="Опубликовать выбранные публикации")
+    def publish(self, request, queryset):
+        self.bulk_update(request, queryset, is_published=True)
+
+    @admin.action(description="Снять с публикации выбранные публикации")
+    def unpublish(self, request, queryset):
+        self.bulk_update(request, queryset, is_published=False)
+
+    @admin.action(description="Перенести в другую категорию")
+    def recategorize(self, request, queryset):
+        return self.bulk_change_form(
+            request, queryset, BulkCategoryForm, "recategorize")
+
+    @admin.action(description="Изменить местоположение")
+    def relocate(self, request, queryset):
+        return self.bulk_change_form(
+            request, queryset, BulkLocationForm, "relocate")
 
 
 admin.site.register(Post, PostAdmin)
 
 
+class TopRelatedFilter(admin.SimpleListFilter):
+    # В списке только самые активные значения, но фильтр принимает любой
+    # id из адреса: полный список пользователей и постов не грузим.
+    field = None
+    label_field = None
+    limit = 20
+
+    def lookups(self, request, model_admin):
+        # Группировка идёт по всей таблице, поэтому список пересчитывается
+        # не чаще раза в ADMIN_COUNT_CACHE_TIMEOUT, а не при каждом показе.
+        def load():
+            rows = (
+                model_admin.get_queryset(request).order_by()
+                .values(self.field, self.label_field)
+                .annotate(total=Count("pk")).order_by("-total")[:self.limit]
+            )
+            return [(row[self.field], row[self.label_field]) for row in rows]
+
+        return cache.get_or_set(
+            f"admin:top:{model_admin.opts.label_lower}:{self.parameter_name}",
+            load,
+            ADMIN_COUNT_CACHE_TIMEOUT,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.field: self.value()})
+        return queryset
+
+
+class CommentAuthorFilter(TopRelatedFilter):
+    title = "автор"
+    parameter_name = "author"
+    field = "author_id"
+    label_field = "author__username"
+
+
+class CommentPostFilter(TopRelatedFilter):
+    title = "публикация"
+    parameter_name = "post"
+    field = "post_id"
+    label_field = "post__title"
+
+
+class CommentAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    search_fields = ("text",)
+    list_display = ("id", "text", "author", "post", "created_at")
+    list_select_related = ("author", "post")
+    list_filter = (CommentAuthorFilter, CommentPostFilter, "created_at")
+    actions = ("delete_spam",)
+    date_hierarchy = "created_at"
+    raw_id_fields = ("author", "post")
+    empty_value_display = "Не задано"
+
+    @admin.action(description="Удалить как спам")
+    def delete_spam(self, request, queryset):
+        deleted = delete_comments(queryset)
+        self.message_user(request, f"Удалено комментариев: {deleted}")
+
+
+admin.site.register(Comment, CommentAdmin)
+
+
 class LocationAdmin(admin.ModelAdmin):
     list_display = ("name", "is_published", "created_at")
     list_editable = ("is_published",)
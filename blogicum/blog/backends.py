@@ -0,0 +1,86 @@
+from time import time_ns
+
+from django.contrib import auth
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from .cache import cache_is_on_disk, cache_is_shared
+
+from constants.constants import AUTH_USER_CACHE_TIMEOUT
+
+CACHED_BACKEND = f'{__name__}.CachedModelBackend'
+
+# Пароль не кэшируем: сессию сверяем с сохранённым хэшем сессии,
+# а сам пароль подгрузится из базы, только если он понадобится.
+AUTH_USER_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email', 'is_active',
+    'is_staff', 'is_superuser', 'last_login', 'date_joined',
+)
+
+
+def auth_cache_enabled():
+    # В кэше процесса сброс версии не дойдёт до других воркеров, а файловый
+    # кэш пишет данные на диск: в обоих случаях пользователей не кэшируем.
+    return cache_is_shared() and not cache_is_on_disk()
+
+
+def auth_user_version_key(user_id):
+    return f'auth-user:{user_id}:version'
+
+
+def auth_user_cache_key(user_id):
+    version = cache.get_or_set(auth_user_version_key(user_id), time_ns, None)
+    return f'auth-user:{user_id}:{version}'
+
+
+def forget_auth_user(user_id):
+    try:
+        cache.incr(auth_user_version_key(user_id))
+    except ValueError:
+        cache.set(auth_user_version_key(user_id), time_ns(), None)
+
+
+def user_from_cache(data):
+    model = get_user_model()
+    fields = [field.attname for field in model._meta.concrete_fields
+              if field.attname in data]
+    user = model.from_db(
+        'default', fields, [data[field] for field in fields])
+    user.backend = CACHED_BACKEND
+    return user
+
+
+def get_cached_user(request):
+    session = request.session
+    user_id = session.get(auth.SESSION_KEY)
+    if (user_id is None or not auth_cache_enabled()
+            or session.get(auth.BACKEND_SESSION_KEY) != CACHED_BACKEND):
+        return None
+    data = cache.get(auth_user_cache_key(user_id))
+    if data is None or not constant_time_compare(
+            session.get(auth.HASH_SESSION_KEY) or '', data['session_hash']):
+        return None
+    return user_from_cache(data)
+
+
+def get_session_user(request):
+    # Замена django.contrib.auth.middleware.get_user: при совпадении хэша
+    # сессии с кэшем пользователь собирается без запроса к базе, иначе
+    # проверку целиком выполняет Django.
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = (
+            get_cached_user(request) or auth.get_user(request))
+    return request._cached_user
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = super().get_user(user_id)
+        if user is not None and auth_cache_enabled():
+            data = {field: getattr(user, field) for field in AUTH_USER_FIELDS}
+            data['session_hash'] = user.get_session_auth_hash()
+            cache.set(auth_user_cache_key(user_id), data,
+                      AUTH_USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+from threading import Condition
+
+from django.db import transaction
+from django.db.models import F
+
+from .bulk import post_purge_rows
+from .models import Comment, Post
+from .purge import post_urls, purge, purge_enabled
+
+from constants.constants import COMMENT_BATCH_DELAY, COMMENT_BATCH_SIZE
+
+
+def flush_comments(comments):
+    totals = Counter(comment.post_id for comment in comments)
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        for post_id, total in totals.items():
+            Post.objects.filter(pk=post_id).update(
+                comment_count=F('comment_count') + total)
+        # bulk_create не посылает post_save: страницы постов сбрасываем сами.
+        if purge_enabled():
+            purge([url for row in post_purge_rows(list(totals))
+                   for url in post_urls(*row)])
+
+
+class _PendingComment:
+    __slots__ = ('comment', 'done', 'error')
+
+    def __init__(self, comment):
+        self.comment = comment
+        self.done = False
+        self.error = None
+
+
+class CommentBatcher:
+    """Групповая запись комментариев.
+
+    Первый запрос в пустой очереди становится ведущим: ждёт до
+    max_delay секунд (или пока не наберётся max_batch комментариев) и
+    записывает всю пачку одной транзакцией. Остальные запросы ждут
+    завершения записи, поэтому после ответа комментарий уже в базе.
+    """
+
+    def __init__(self, max_batch=COMMENT_BATCH_SIZE,
+                 max_delay=COMMENT_BATCH_DELAY, flush=flush_comments):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.flush = flush
+        self._pending = []
+        self._cond = Condition()
+
+    def _collect_batch(self):
+        deadline = time.monotonic() + self.max_delay
+        while len(self._pending) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush_batch(self, batch):
+        error = None
+        try:
+            self.flush([pending.comment for pending in batch])
+        except Exception as exc:
+            error = exc
+        with self._cond:
+            for pending in batch:
+                pending.done = True
+                pending.error = error
+            self._cond.notify_all()
+
+    def submit(self, comment):
+        entry = _PendingComment(comment)
+        with self._cond:
+            self._pending.append(entry)
+            batch = None
+            if len(self._pending) == 1:
+                batch = self._collect_batch()
+            elif len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+        if batch is not None:
+            self._flush_batch(batch)
+        with self._cond:
+            while not entry.done:
+                self._cond.wait()
+        if entry.error is not None:
+            raise entry.error
+        return comment
+
+
+comment_batcher = CommentBatcher()
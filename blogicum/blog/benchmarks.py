@@ -0,0 +1,98 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Paginator
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+
+from .forms import CommentForm
+from .models import Category, Comment, Location, Post, User
+
+from constants.constants import AMOUNT_POSTS
+
+
+def django_engine(profile):
+    config = next(
+        config for config in settings.TEMPLATES
+        if config['BACKEND'].endswith('DjangoTemplates')
+    )
+    options = {
+        key: value for key, value in config['OPTIONS'].items()
+        if key not in settings.TEMPLATE_PRODUCTION_OPTIONS
+    }
+    if profile == 'production':
+        options.update(settings.TEMPLATE_PRODUCTION_OPTIONS)
+    return DjangoTemplates({
+        'NAME': f'bench-{profile}',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': profile != 'production',
+        'OPTIONS': options,
+    })
+
+
+def jinja2_engine():
+    from django.template.backends.jinja2 import Jinja2
+
+    params = {key: value for key, value in settings.JINJA2_TEMPLATES.items()
+              if key != 'BACKEND'}
+    return Jinja2({**params, 'NAME': 'bench-jinja2'})
+
+
+def sample_posts(count=AMOUNT_POSTS):
+    author = User(id=1, username='author')
+    category = Category(id=1, title='Категория', slug='category',
+                        is_published=True)
+    location = Location(id=1, name='Место', is_published=True)
+    text = 'Текст публикации ' * 20
+    return [
+        Post(id=i, title=f'Публикация {i}', author=author, text=text,
+             excerpt=Post.make_excerpt(text), category=category,
+             location=location, pub_date=timezone.now(), comment_count=i)
+        for i in range(1, count + 1)
+    ]
+
+
+def sample_request(path='/'):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path)
+    return request
+
+
+def measure(engine_factory, template_name, context, request, renders=100):
+    started = time.perf_counter()
+    engine = engine_factory()
+    template = engine.get_template(template_name)
+    parse = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(renders):
+        html = template.render(context, request)
+    render = (time.perf_counter() - started) / renders
+    return {'parse': parse, 'render': render, 'html': html}
+
+
+def feed_contexts(count=AMOUNT_POSTS):
+    posts = sample_posts(count)
+    post = posts[0]
+    page_obj = Paginator(posts, AMOUNT_POSTS).get_page(1)
+    comments = [
+        Comment(id=i, post=post, author=post.author, text=f'Комментарий {i}',
+                created_at=timezone.now())
+        for i in range(1, 4)
+    ]
+    return {
+        'blog/index.html': ('/', {'page_obj': page_obj}),
+        'blog/category.html': (
+            f'/category/{post.category.slug}/',
+            {'category': post.category, 'page_obj': page_obj}),
+        'blog/profile.html': (
+            f'/profile/{post.author.username}/',
+            {'profile': post.author, 'page_obj': page_obj}),
+        'blog/detail.html': (
+            f'/posts/{post.id}/',
+            {'post': post, 'comments': comments, 'form': CommentForm()}),
+    }
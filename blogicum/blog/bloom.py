@@ -0,0 +1,128 @@
+import hashlib
+import math
+from threading import Lock
+from time import time_ns
+
+from django.core.cache import cache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+
+from constants.constants import (USERNAME_FILTER_CAPACITY,
+                                 USERNAME_FILTER_ERROR_RATE)
+
+
+class CountingBloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(1, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.counters = bytearray(self.size)
+        self.count = 0
+
+    @property
+    def memory_footprint(self):
+        return len(self.counters)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size
+                for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            if self.counters[position] < 255:
+                self.counters[position] += 1
+        self.count += 1
+
+    def remove(self, item):
+        positions = self._positions(item)
+        if not all(self.counters[position] for position in positions):
+            return
+        for position in positions:
+            # Насыщенный счётчик не уменьшаем: он мог переполниться.
+            if self.counters[position] < 255:
+                self.counters[position] -= 1
+        self.count -= 1
+
+    def __contains__(self, item):
+        return all(self.counters[position]
+                   for position in self._positions(item))
+
+
+class UsernameFilter:
+    """Bloom-фильтр существующих имён пользователей.
+
+    Каждый процесс держит свою копию; версия в общем кэше меняется при
+    создании, переименовании и удалении пользователя, и процесс, чья
+    копия отстала, перестраивает её из базы. С кэшем в памяти процесса
+    версия не общая, поэтому отрицательному ответу фильтра не доверяют.
+    """
+
+    version_key = 'bloom:usernames:version'
+
+    def __init__(self, capacity=USERNAME_FILTER_CAPACITY,
+                 error_rate=USERNAME_FILTER_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = None
+        self.version = None
+        self._lock = Lock()
+
+    def shared_version(self):
+        # Начальная версия от времени: после вытеснения ключа копия,
+        # построенная при старой версии, не сочтёт себя актуальной.
+        return cache.get_or_set(self.version_key, time_ns, None)
+
+    def rebuild(self, version=None):
+        from django.contrib.auth import get_user_model
+
+        # Версию читаем до имён: изменение, случившееся во время чтения,
+        # сменит версию, и следующий запрос перестроит фильтр снова.
+        version = version or self.shared_version()
+        usernames = get_user_model().objects.values_list(
+            'username', flat=True)
+        total = usernames.count()
+        bloom = CountingBloomFilter(max(self.capacity, total * 2),
+                                    self.error_rate)
+        for username in usernames.iterator():
+            bloom.add(username)
+        self.filter = bloom
+        self.version = version
+
+    def might_exist(self, username):
+        version = self.shared_version()
+        if self.filter is None or self.version != version:
+            with self._lock:
+                if self.filter is None or self.version != version:
+                    self.rebuild(version)
+        return username in self.filter
+
+    def _changed(self, update):
+        with self._lock:
+            try:
+                version = cache.incr(self.version_key)
+            except ValueError:
+                version = time_ns()
+                cache.set(self.version_key, version, None)
+            # Изменение применяем к своей копии, только если incr атомарен
+            # (memcached): иначе два процесса могут получить одну версию
+            # при разных фильтрах, поэтому надёжнее перестроить из базы.
+            if (isinstance(cache, BaseMemcachedCache)
+                    and self.filter is not None
+                    and version == self.version + 1):
+                update(self.filter)
+                self.version = version
+            else:
+                self.filter = None
+
+    def added(self, username):
+        self._changed(lambda bloom: bloom.add(username))
+
+    def removed(self, username):
+        self._changed(lambda bloom: bloom.remove(username))
+
+
+username_filter = UsernameFilter()
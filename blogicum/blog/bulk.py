@@ -0,0 +1,139 @@
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .backends import forget_auth_user
+from .models import Comment, Post, User
+from .signals import posts_bulk_changed
+
+from constants.constants import BULK_CHUNK_SIZE
+
+VISIBILITY_FIELDS = {'is_published', 'pub_date', 'category'}
+
+
+def raw_delete(queryset):
+    # Один DELETE по подзапросу ключей, без сборщика связей и сигналов:
+    # только для строк, от которых ничего не зависит.
+    model = queryset.model
+    connection = connections[queryset.db]
+    quote_name = connection.ops.quote_name
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote_name(model._meta.db_table)} '
+            f'WHERE {quote_name(model._meta.pk.column)} IN ({sql})',
+            params,
+        )
+        return cursor.rowcount
+
+
+def iter_pk_chunks(queryset, chunk_size=BULK_CHUNK_SIZE):
+    # Идём по первичному ключу, а не по OFFSET: каждая порция — отдельный
+    # быстрый запрос по индексу, даже если выбраны сотни тысяч строк.
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        chunk = list(
+            (pks if last is None else pks.filter(pk__gt=last))[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def post_purge_rows(pks):
+    return list(Post.all_objects.filter(pk__in=pks).values_list(
+        'pk', 'category__slug', 'author__username'))
+
+
+def bulk_update_posts(queryset, chunk_size=BULK_CHUNK_SIZE, **changes):
+    """Обновляет посты порциями без посылки сигналов для каждой строки.
+
+    После каждой порции отправляет одно событие posts_bulk_changed
+    с постами этой порции.
+    """
+    updated = 0
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            rows = post_purge_rows(pks)
+            chunk = Post.objects.filter(pk__in=pks)
+            updated += chunk.update(**changes)
+            if VISIBILITY_FIELDS & changes.keys():
+                chunk.refresh_visibility()
+            if 'category' in changes:
+                rows += post_purge_rows(pks)
+            posts_bulk_changed.send(sender=Post, rows=rows)
+    return updated
+
+
+def delete_comments(queryset):
+    """Удаляет комментарии одним DELETE на пост, минуя сигналы по строкам.
+
+    Счётчик комментариев каждого поста уменьшается одним UPDATE.
+    """
+    post_ids = list(queryset.order_by().values_list(
+        'post_id', flat=True).distinct())
+    deleted = 0
+    for post_id in post_ids:
+        with transaction.atomic():
+            comments = queryset.filter(post_id=post_id).order_by()
+            # Мягко удалённые комментарии уже вычтены из счётчика.
+            counted = comments.filter(deleted_at__isnull=True).count()
+            # У комментариев нет зависимых объектов.
+            count = raw_delete(comments)
+            Post.objects.filter(pk=post_id).update(
+                comment_count=Greatest(F('comment_count') - counted, 0))
+        deleted += count
+    if post_ids:
+        posts_bulk_changed.send(sender=Post, rows=post_purge_rows(post_ids))
+    return deleted
+
+
+def delete_posts(pks):
+    rows = post_purge_rows(pks)
+    with transaction.atomic():
+        raw_delete(Comment.all_objects.filter(post_id__in=pks))
+        deleted = raw_delete(Post.all_objects.filter(pk__in=pks))
+    if rows:
+        posts_bulk_changed.send(sender=Post, rows=rows)
+    return deleted
+
+
+def purge_user(user, chunk_size=BULK_CHUNK_SIZE):
+    """Удаляет комментарии, посты и самого пользователя порциями.
+
+    Каждая порция — отдельная короткая транзакция, поэтому прерванную
+    очистку можно просто запустить снова. Отдаёт прогресс кортежами
+    (этап, удалено на этапе).
+    """
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    forget_auth_user(user.pk)
+    deleted = 0
+    for pks in iter_pk_chunks(Comment.all_objects.filter(author=user),
+                              chunk_size):
+        deleted += delete_comments(Comment.all_objects.filter(pk__in=pks))
+        yield 'comments', deleted
+    deleted = 0
+    for pks in iter_pk_chunks(Post.all_objects.filter(author=user),
+                              chunk_size):
+        deleted += delete_posts(pks)
+        yield 'posts', deleted
+    user.delete()
+    yield 'user', 1
+
+
+def purge_deleted(before, chunk_size=BULK_CHUNK_SIZE):
+    """Окончательно удаляет мягко удалённые комментарии и посты.
+
+    Отдаёт прогресс кортежами (этап, удалено на этапе).
+    """
+    deleted = 0
+    comments = Comment.all_objects.filter(deleted_at__lte=before)
+    for pks in iter_pk_chunks(comments, chunk_size):
+        deleted += raw_delete(Comment.all_objects.filter(pk__in=pks))
+        yield 'comments', deleted
+    deleted = 0
+    for pks in iter_pk_chunks(
+            Post.all_objects.filter(deleted_at__lte=before), chunk_size):
+        deleted += delete_posts(pks)
+        yield 'posts', deleted
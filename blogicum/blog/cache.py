@@ -0,0 +1,145 @@
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic, time_ns
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import Http404
+
+from constants.constants import (LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TIMEOUT,
+                                 LOOKUP_LOCAL_TIMEOUT, NEGATIVE_CACHE_SIZE,
+                                 NEGATIVE_CACHE_TIMEOUT)
+
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize, timeout=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            expires, value = self._data[key]
+            if expires is not None and expires <= monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        expires = None if self.timeout is None else monotonic() + self.timeout
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def cache_is_shared(alias='default'):
+    # Память процесса не видна другим воркерам, файлы и memcached — видны.
+    return not isinstance(caches[alias], LocMemCache)
+
+
+def cache_is_on_disk(alias='default'):
+    return isinstance(caches[alias], FileBasedCache)
+
+
+class CachedNotFound(Http404):
+    pass
+
+
+class LookupCache:
+    def __init__(self, alias='default', maxsize=LOOKUP_CACHE_SIZE,
+                 timeout=LOOKUP_CACHE_TIMEOUT,
+                 local_timeout=LOOKUP_LOCAL_TIMEOUT,
+                 negative_maxsize=NEGATIVE_CACHE_SIZE,
+                 negative_timeout=NEGATIVE_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self.local = LRUCache(maxsize, local_timeout)
+        self.negative = LRUCache(negative_maxsize)
+        self.negative_timeout = negative_timeout
+        self.stats = Counter()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _version_key(self, namespace):
+        return f'lookup:{namespace}:version'
+
+    def version(self, namespace):
+        # Начальная версия берётся от времени, чтобы после вытеснения ключа
+        # версии из общего кэша не ожили старые записи локального LRU.
+        return self.shared.get_or_set(
+            self._version_key(namespace), time_ns, None)
+
+    def timeouts(self):
+        # С кэшем в памяти процесса сброс версии не дойдёт до других
+        # воркеров: держим записи не дольше локального уровня.
+        if cache_is_shared(self.alias):
+            return self.timeout, self.negative_timeout
+        return (min(self.timeout, self.local_timeout),
+                min(self.negative_timeout, self.local_timeout))
+
+    def get_or_load(self, namespace, key, loader):
+        cache_key = f'lookup:{namespace}:{self.version(namespace)}:{key}'
+        value = self.local.get(cache_key, MISSING)
+        if value is not MISSING:
+            self.stats['local_hits'] += 1
+            # Каждый запрос получает свою копию: изменения экземпляра
+            # в одном запросе не должны попасть в кэш процесса.
+            return deepcopy(value)
+        # Отсутствующие объекты помнятся только в памяти процесса: ключ
+        # содержит версию, поэтому создание объекта сбрасывает и их.
+        expires = self.negative.get(cache_key)
+        if expires is not None and expires > monotonic():
+            self.stats['negative_hits'] += 1
+            raise CachedNotFound(f'{namespace} {key} not found')
+        value = self.shared.get(cache_key, MISSING)
+        if value is not MISSING:
+            self.stats['shared_hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            timeout, negative_timeout = self.timeouts()
+            try:
+                value = loader()
+            except Http404:
+                self.negative.set(cache_key, monotonic() + negative_timeout)
+                raise
+            self.shared.set(cache_key, value, timeout)
+        self.local.set(cache_key, deepcopy(value))
+        return value
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            version_key = self._version_key(namespace)
+            try:
+                self.shared.incr(version_key)
+            except ValueError:
+                self.shared.set(version_key, time_ns(), None)
+            self.stats['invalidations'] += 1
+
+    def clear(self):
+        self.local.clear()
+        self.negative.clear()
+        self.stats.clear()
+
+
+lookup_cache = LookupCache()
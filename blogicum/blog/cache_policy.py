@@ -0,0 +1,42 @@
+from functools import wraps
+
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+
+def is_anonymous_request(request):
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def is_private_response(request, response):
+    session = getattr(request, 'session', None)
+    return (response.status_code != 200 or response.cookies
+            or request.META.get('CSRF_COOKIE_USED')
+            or session is not None and session.modified
+            or not is_anonymous_request(request))
+
+
+def apply_cache_policy(request, response, max_age, stale_while_revalidate,
+                       vary):
+    patch_vary_headers(response, vary)
+    if is_private_response(request, response):
+        patch_cache_control(response, private=True)
+        return response
+    directives = {'public': True, 'max_age': max_age}
+    if stale_while_revalidate:
+        directives['stale_while_revalidate'] = stale_while_revalidate
+    patch_cache_control(response, **directives)
+    return response
+
+
+def cache_policy(max_age, stale_while_revalidate=0, vary=('Cookie',)):
+    # Декоратор только помечает ответ: заголовки выставляет
+    # CachePolicyMiddleware, когда сессия и CSRF уже добавили свои cookies.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            response.cache_policy = (max_age, stale_while_revalidate, vary)
+            return response
+        return wrapper
+    return decorator
@@ -1,7 +1,7 @@
 from django import forms
 from django.utils import timezone
 
-from .models import Comment, Post, User
+from .models import Category, Comment, Location, Post, User
 
 
 class PostForm(forms.ModelForm):
@@ -35,3 +35,13 @@ class UserProfileForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ['username', 'first_name', 'last_name', 'email']
+
+
+class BulkCategoryForm(forms.Form):
+    category = forms.ModelChoiceField(
+        Category.objects.all(), label='Категория')
+
+
+class BulkLocationForm(forms.Form):
+    location = forms.ModelChoiceField(
+        Location.objects.all(), label='Местоположение', required=False)
@@ -0,0 +1,172 @@
+import json
+import math
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.test import Client
+from django.urls import Resolver404, resolve
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def read_request_log(path):
+    with open(path, encoding='utf-8') as log:
+        for line in log:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def url_name(path):
+    try:
+        return resolve(urllib.parse.urlsplit(path).path).view_name
+    except Resolver404:
+        return '<404>'
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class InProcessTransport:
+    def __init__(self):
+        self._local = threading.local()
+
+    def _client(self, username):
+        clients = self._local.__dict__.setdefault('clients', {})
+        if username not in clients:
+            client = Client()
+            if username:
+                client.force_login(
+                    get_user_model().objects.get(username=username))
+            clients[username] = client
+        return clients[username]
+
+    def send(self, entry):
+        client = self._client(entry.get('user'))
+        method = getattr(client, entry.get('method', 'GET').lower())
+        return method(entry['path'], entry.get('data') or {}).status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPTransport:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self._cookies = {}
+        self._lock = threading.Lock()
+
+    def _cookies_for(self, username):
+        with self._lock:
+            if username not in self._cookies:
+                request = HttpRequest()
+                token = get_token(request)
+                cookies = {settings.CSRF_COOKIE_NAME:
+                           request.META['CSRF_COOKIE']}
+                if username:
+                    client = Client()
+                    client.force_login(
+                        get_user_model().objects.get(username=username))
+                    cookie_name = settings.SESSION_COOKIE_NAME
+                    cookies[cookie_name] = client.cookies[cookie_name].value
+                self._cookies[username] = (cookies, token)
+            return self._cookies[username]
+
+    def send(self, entry):
+        cookies, token = self._cookies_for(entry.get('user'))
+        method = entry.get('method', 'GET').upper()
+        data = None
+        if method != 'GET':
+            form = dict(entry.get('data') or {})
+            form['csrfmiddlewaretoken'] = token
+            data = urllib.parse.urlencode(form, doseq=True).encode()
+        cookie = SimpleCookie(cookies)
+        request = urllib.request.Request(
+            self.base_url + entry['path'], data=data, method=method,
+            headers={'Cookie': cookie.output(header='', sep=';').strip()}
+        )
+        opener = urllib.request.build_opener(_NoRedirect)
+        try:
+            with opener.open(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+class LoadTestReport:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        return sum(len(values) for values in self.latencies.values())
+
+    def add(self, name, latency, failed):
+        with self._lock:
+            self.latencies[name].append(latency)
+            if failed:
+                self.errors[name] += 1
+
+    def rows(self):
+        for name in sorted(self.latencies):
+            values = self.latencies[name]
+            yield {
+                'url_name': name,
+                'count': len(values),
+                'error_rate': self.errors[name] / len(values),
+                **{f'p{p}': percentile(values, p) * 1000
+                   for p in PERCENTILES},
+            }
+
+    def summary(self):
+        total = self.total
+        return {
+            'requests': total,
+            'elapsed': self.elapsed,
+            'throughput': total / self.elapsed if self.elapsed else 0.0,
+            'error_rate': sum(self.errors.values()) / total if total else 0.0,
+        }
+
+
+def replay(entries, transport, concurrency=1):
+    report = LoadTestReport()
+
+    def run(entry):
+        started = time.perf_counter()
+        try:
+            failed = transport.send(entry) >= 500
+        except Exception:
+            failed = True
+        report.add(url_name(entry['path']), time.perf_counter() - started,
+                   failed)
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run, entries))
+    else:
+        for entry in entries:
+            run(entry)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from blog.loadtest import (PERCENTILES, HTTPTransport, InProcessTransport,
+                           read_request_log, replay)
+
+
+class Command(BaseCommand):
+    help = 'Воспроизводит журнал запросов (JSONL) и выводит статистику.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('log', help='Путь к журналу запросов JSONL.')
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument(
+            '--target', default='inprocess',
+            help='inprocess или базовый URL сервера, '
+                 'например http://127.0.0.1:8000'
+        )
+
+    def handle(self, *args, **options):
+        entries = list(read_request_log(options['log'])) * options['repeat']
+        if options['target'] == 'inprocess':
+            transport = InProcessTransport()
+        else:
+            transport = HTTPTransport(options['target'])
+        report = replay(entries, transport, options['concurrency'])
+
+        summary = report.summary()
+        self.stdout.write(
+            f"Запросов: {summary['requests']}, "
+            f"время: {summary['elapsed']:.2f} с, "
+            f"пропускная способность: {summary['throughput']:.1f} запр/с, "
+            f"ошибки: {summary['error_rate']:.1%}"
+        )
+        header = ['url_name', 'count', 'error_rate'] + [
+            f'p{p}' for p in PERCENTILES]
+        self.stdout.write('\t'.join(header))
+        for row in report.rows():
+            self.stdout.write('\t'.join(
+                f'{row[key]:.1f}' if key.startswith('p') else
+                f'{row[key]:.1%}' if key == 'error_rate' else str(row[key])
+                for key in header
+            ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+
+from blog.cache import cache_is_shared
+from blog.startup import PreforkServer, warm_up
+
+
+class Command(BaseCommand):
+    help = ('Загружает приложение один раз и форкает готовые воркеры, '
+            'которые слушают общий сокет.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('addrport', nargs='?', default='127.0.0.1:8000')
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        # Версии кэшей, аренды и лимиты запросов должны быть общими
+        # для всех воркеров, а кэш в памяти у каждого процесса свой.
+        if not cache_is_shared():
+            raise CommandError(
+                'Кэш в памяти процесса не общий для воркеров: запустите '
+                'с BLOGICUM_CACHE=file или BLOGICUM_CACHE=memcached.')
+        from blogicum.wsgi import application
+
+        host, port = options['addrport'].rsplit(':', 1)
+        warm_up()
+        server = WSGIServer((host, int(port)), WSGIRequestHandler)
+        server.set_app(application)
+        self.stdout.write(
+            f"Слушаю {host}:{port}, воркеров: {options['workers']}")
+        PreforkServer(server, options['workers']).run()
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import acquire_lease, promote_due_posts, release_lease
+
+from constants.constants import SCHEDULER_BATCH_SIZE, SCHEDULER_INTERVAL
+
+
+class Command(BaseCommand):
+    help = ('Публикует отложенные посты, дата которых наступила. '
+            'По умолчанию выполняет один проход (для cron).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно с интервалом.')
+        parser.add_argument('--interval', type=float,
+                            default=SCHEDULER_INTERVAL)
+        parser.add_argument('--batch-size', type=int,
+                            default=SCHEDULER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options['batch_size'])
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def run_once(self, batch_size):
+        token = acquire_lease()
+        if token is None:
+            self.stdout.write('Проход уже выполняет другой обработчик.')
+            return
+        try:
+            promoted = promote_due_posts(batch_size)
+        finally:
+            release_lease(token)
+        self.stdout.write(f'Опубликовано постов: {promoted}')
@@ -0,0 +1,41 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.bulk import purge_deleted
+
+from constants.constants import BULK_CHUNK_SIZE, SOFT_DELETE_RETENTION
+
+STAGES = {
+    'comments': 'Удалено комментариев',
+    'posts': 'Удалено постов',
+}
+
+
+class Command(BaseCommand):
+    help = ('Окончательно удаляет мягко удалённые посты и комментарии '
+            'порциями. Запускайте по cron в часы низкой нагрузки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=SOFT_DELETE_RETENTION,
+            help='Удалять записи, помеченные раньше, чем столько секунд '
+                 'назад.')
+        parser.add_argument('--chunk-size', type=int,
+                            default=BULK_CHUNK_SIZE)
+        parser.add_argument(
+            '--max-seconds', type=float, default=None,
+            help='Остановиться после порции, если время вышло; '
+                 'следующий запуск продолжит с того же места.')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(seconds=options['older_than'])
+        started = time.monotonic()
+        for stage, done in purge_deleted(before, options['chunk_size']):
+            self.stdout.write(f'{STAGES[stage]}: {done}')
+            if (options['max_seconds'] is not None
+                    and time.monotonic() - started > options['max_seconds']):
+                self.stdout.write('Время вышло, очистка прервана.')
+                return
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.bulk import purge_user
+from blog.models import User
+
+from constants.constants import BULK_CHUNK_SIZE
+
+STAGES = {
+    'comments': 'Удалено комментариев',
+    'posts': 'Удалено постов',
+}
+
+
+class Command(BaseCommand):
+    help = ('Блокирует пользователя и порциями удаляет его комментарии, '
+            'посты и учётную запись. Прерванный запуск можно повторить.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--chunk-size', type=int,
+                            default=BULK_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f"Пользователь {options['username']} не найден.")
+        for stage, done in purge_user(user, options['chunk_size']):
+            if stage == 'user':
+                self.stdout.write(f'Пользователь {user.username} удалён.')
+            else:
+                self.stdout.write(f'{STAGES[stage]}: {done}')
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from blog.startup import group_by_package, profile_startup
+
+
+class Command(BaseCommand):
+    help = ('Замеряет запуск воркера в отдельном процессе: время этапов '
+            'и импорта каждого модуля.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20,
+                            help='Сколько самых медленных модулей вывести.')
+
+    def handle(self, *args, **options):
+        phases, modules = profile_startup(
+            os.environ['DJANGO_SETTINGS_MODULE'])
+        self.stdout.write('Этапы запуска, мс:')
+        for phase, seconds in phases.items():
+            self.stdout.write(f'{phase}\t{seconds * 1000:.1f}')
+
+        self.stdout.write('\nПакеты (собственное время импорта), мс:')
+        for package, self_us in group_by_package(modules)[:options['top']]:
+            self.stdout.write(f'{package}\t{self_us / 1000:.1f}')
+
+        self.stdout.write('\nМодули (собственное / суммарное), мс:')
+        slowest = sorted(modules, key=lambda row: row[1], reverse=True)
+        for name, self_us, cumulative_us in slowest[:options['top']]:
+            self.stdout.write(
+                f'{name}\t{self_us / 1000:.1f}\t{cumulative_us / 1000:.1f}')
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import (django_engine, feed_contexts, jinja2_engine,
+                             measure, sample_request)
+
+
+class Command(BaseCommand):
+    help = ('Замеряет время разбора и отрисовки шаблонов ленты '
+            '(десять карточек публикаций) для разных движков.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=200)
+        parser.add_argument(
+            '--template', action='append', dest='templates',
+            help='Шаблон для замера; по умолчанию blog/index.html.'
+        )
+
+    def engines(self):
+        engines = {
+            'django-debug': lambda: django_engine('debug'),
+            'django-production': lambda: django_engine('production'),
+        }
+        try:
+            import jinja2  # noqa: F401
+        except ImportError:
+            self.stderr.write('Jinja2 не установлен, движок пропущен.')
+        else:
+            engines['jinja2'] = jinja2_engine
+        return engines
+
+    def handle(self, *args, **options):
+        contexts = feed_contexts()
+        for template_name in options['templates'] or ['blog/index.html']:
+            path, context = contexts[template_name]
+            request = sample_request(path)
+            self.stdout.write(template_name)
+            for name, factory in self.engines().items():
+                result = measure(factory, template_name, context, request,
+                                 options['renders'])
+                self.stdout.write(
+                    f"  {name}: разбор {result['parse'] * 1000:.2f} мс, "
+                    f"отрисовка {result['render'] * 1000:.3f} мс, "
+                    f"{1 / result['render']:.0f} отрисовок/с"
+                )
@@ -0,0 +1,183 @@
+import json
+import re
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+
+from .backends import get_session_user
+from .cache_policy import apply_cache_policy
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SKIPPED_FIELDS = ('csrfmiddlewaretoken',)
+
+
+class RequestRecorderMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.path = getattr(settings, 'REQUEST_LOG_PATH', None)
+        if not self.path:
+            raise MiddlewareNotUsed
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        started = time.time()
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        entry = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'user': user.get_username() if user and user.is_authenticated
+            else None,
+            'data': {
+                key: values if len(values) > 1 else values[0]
+                for key, values in request.POST.lists()
+                if key not in SKIPPED_FIELDS and 'password' not in key
+            },
+            'ts': started,
+            'status': response.status_code,
+        }
+        with self._lock, open(self.path, 'a', encoding='utf-8') as log:
+            log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return response
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.level = settings.COMPRESSION_LEVEL
+
+    def choose_encoding(self, request):
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re.search(r'\bbr\b', accepted):
+            return 'br'
+        if re.search(r'\bgzip\b', accepted):
+            return 'gzip'
+        return None
+
+    def compressor(self, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=min(self.level, 11))
+            return compressor.process, compressor.flush, compressor.finish
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        return (compressor.compress,
+                lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+                compressor.flush)
+
+    def compress_stream(self, content, encoding):
+        compress, flush, finish = self.compressor(encoding)
+        for chunk in content:
+            # Сбрасываем буфер после каждого фрагмента, чтобы сжатие
+            # не задерживало отправку начала страницы.
+            yield compress(chunk) + flush()
+        yield finish()
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.has_header('Content-Encoding')
+                or not response.streaming
+                and len(response.content) < self.min_size):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            compress, _, finish = self.compressor(encoding)
+            compressed = compress(response.content) + finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class CachePolicyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        policy = getattr(response, 'cache_policy', None)
+        if policy is None:
+            return response
+        return apply_cache_policy(request, response, *policy)
+
+
+def is_anonymous_fast_path(request):
+    return getattr(request, 'anonymous_fast_path', False)
+
+
+class AnonymousFastPathMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.views = set(settings.ANONYMOUS_FAST_PATH_VIEWS)
+
+    def eligible(self, request):
+        if (request.method not in ('GET', 'HEAD')
+                or settings.SESSION_COOKIE_NAME in request.COOKIES):
+            return False
+        try:
+            return resolve(request.path_info).view_name in self.views
+        except Resolver404:
+            return False
+
+    def __call__(self, request):
+        request.anonymous_fast_path = self.eligible(request)
+        if request.anonymous_fast_path:
+            request.user = AnonymousUser()
+        return self.get_response(request)
+
+
+class FastPathSessionMiddleware(SessionMiddleware):
+    def process_request(self, request):
+        if not is_anonymous_fast_path(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_anonymous_fast_path(request):
+            return response
+        return super().process_response(request, response)
+
+
+class FastPathAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        if not is_anonymous_fast_path(request):
+            request.user = SimpleLazyObject(
+                lambda: get_session_user(request))
+
+
+class FastPathMessageMiddleware(MessageMiddleware):
+    def process_request(self, request):
+        if not is_anonymous_fast_path(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_anonymous_fast_path(request):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    counts = Comment.objects.values('post_id').annotate(
+        total=models.Count('id'))
+    for row in counts:
+        Post.objects.filter(pk=row['post_id']).update(
+            comment_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_comment_author'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='blog.post', verbose_name='Комментируемый пост'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:41
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+from constants.constants import EXCERPT_WORDS
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('id', 'text').iterator():
+        post.excerpt = Truncator(post.text).words(
+            EXCERPT_WORDS, truncate=' …')
+        posts.append(post)
+    Post.objects.bulk_update(posts, ['excerpt'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:51
+
+from django.db import migrations, models
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Category = apps.get_model('blog', 'Category')
+    moment = timezone.now()
+    ready = Q(is_published=True,
+              category__in=Category.objects.filter(is_published=True))
+    Post.objects.update(
+        is_visible=Case(
+            When(ready & Q(pub_date__lte=moment), then=Value(True)),
+            default=Value(False),
+        ),
+        pending_until=Case(
+            When(ready & Q(pub_date__gt=moment), then=F('pub_date')),
+            default=Value(None),
+            output_field=models.DateTimeField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_author_timeline_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Видна читателям'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='pending_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Ожидает публикации до'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_visible', '-pub_date'], name='post_visible_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['pending_until'], name='post_pending_until_idx'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lease',
+            fields=[
+                ('name', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Название')),
+                ('token', models.CharField(max_length=32, verbose_name='Владелец')),
+                ('expires_at', models.DateTimeField(verbose_name='Действует до')),
+            ],
+            options={
+                'verbose_name': 'аренда',
+                'verbose_name_plural': 'Аренды',
+            },
+        ),
+    ]
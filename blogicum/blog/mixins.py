@@ -1,17 +1,33 @@
-from django.db.models import Count
-from django.http import HttpResponseRedirect
+from http import HTTPStatus
+
+from django.conf import settings
+from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 
 from .models import Post
+from .ratelimit import client_ip, rate_limiter
+from .service import project_feed
+
+from constants.constants import AMOUNT_POSTS, IP_RATE_LIMIT_FACTOR
 
-from constants.constants import AMOUNT_POSTS
 
+class SingleObjectMemoMixin:
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_memo_object'):
+            self._memo_object = super().get_object()
+        return self._memo_object
 
-class AuthorRequiredMixin:
+
+class AuthorRequiredMixin(SingleObjectMemoMixin):
     def dispatch(self, request, *args, **kwargs):
         post = self.get_object()
-        if post.author != request.user:
+        if post.author_id != request.user.pk:
             return redirect('blog:post_detail', post_id=post.pk)
         return super().dispatch(request, *args, **kwargs)
 
@@ -20,14 +36,55 @@ class PostListMixin:
     paginate_by = AMOUNT_POSTS
 
     def get_queryset(self):
-        return Post.objects.annotate(
-            comment_count=Count('comments')).order_by('-pub_date')
+        return project_feed(Post.objects.order_by('-pub_date'))
+
+
+class AutRequiredMixin(AuthorRequiredMixin):
+    pass
+
+
+class SoftDeleteMixin:
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        success_url = self.get_success_url()
+        # Строки и их зависимости удаляет команда purge_deleted.
+        self.object.soft_delete()
+        return redirect(success_url)
+
+
+class CommentAuthorMixin(SingleObjectMemoMixin):
+    def test_func(self):
+        return self.request.user.pk == self.get_object().author_id
+
+    def get_success_url(self):
+        return reverse('blog:post_detail',
+                       kwargs={'post_id': self.get_object().post_id})
+
+
+class RateLimitMixin:
+    ratelimit = None
+    ratelimit_methods = ('POST',)
+    ratelimit_ip_factor = IP_RATE_LIMIT_FACTOR
 
+    def get_ratelimit_keys(self, request):
+        scope = type(self).__name__
+        capacity, period = self.ratelimit
+        keys = [(f'{scope}:ip:{client_ip(request)}',
+                 capacity * self.ratelimit_ip_factor, period)]
+        if request.user.is_authenticated:
+            keys.append((f'{scope}:user:{request.user.pk}', capacity, period))
+        return keys
 
-class AutRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
-        obj = self.get_object()
-        if obj.author != self.request.user:
-            return HttpResponseRedirect(reverse('blog:post_detail',
-                                                kwargs={'post_id': obj.pk}))
+        if (settings.RATELIMIT_ENABLED and self.ratelimit
+                and request.method in self.ratelimit_methods):
+            for key, capacity, period in self.get_ratelimit_keys(request):
+                if not rate_limiter.allow(key, capacity, period):
+                    response = HttpResponse(
+                        'Слишком много запросов, попробуйте позже.',
+                        status=HTTPStatus.TOO_MANY_REQUESTS
+                    )
+                    response['Retry-After'] = str(
+                        rate_limiter.retry_after(period))
+                    return response
         return super().dispatch(request, *args, **kwargs)
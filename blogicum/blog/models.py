@@ -1,11 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
+from django.utils.text import Truncator
 
 from constants.constants import (
     REPRESENTATION_LENGTH,
     MAX_FIELD_LENGTH,
-    MAX_COMMENT_LENGTH
+    MAX_COMMENT_LENGTH,
+    EXCERPT_WORDS
 )
 
 User = get_user_model()
@@ -24,6 +27,25 @@ class Publication(models.Model):
         ordering = ("created_at",)
 
 
+class SoftDeletable(models.Model):
+    deleted_at = models.DateTimeField(
+        "Удалено", null=True, blank=True, editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted_at"])
+
+
+class SoftDeleteManager(models.Manager):
+    # Менеджер по умолчанию скрывает удалённое; all_objects видит всё.
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Location(Publication):
     name = models.CharField(
         "Название места", max_length=MAX_FIELD_LENGTH)
@@ -56,9 +78,37 @@ class Category(Publication):
         return self.title[:REPRESENTATION_LENGTH]
 
 
-class Post(Publication):
+class PostQuerySet(models.QuerySet):
+    def visible(self):
+        # Одно условие по индексированному флагу: отложенные посты
+        # становятся видны, когда их включит команда publish_scheduled,
+        # поэтому она должна работать постоянно (--loop) или по cron.
+        return self.filter(is_visible=True)
+
+    def refresh_visibility(self, moment=None):
+        moment = moment or timezone.now()
+        ready = Q(
+            is_published=True, deleted_at__isnull=True,
+            category__in=Category.objects.filter(
+                is_published=True).values('pk'),
+        )
+        return self.update(
+            is_visible=Case(
+                When(ready & Q(pub_date__lte=moment), then=Value(True)),
+                default=Value(False),
+            ),
+            pending_until=Case(
+                When(ready & Q(pub_date__gt=moment), then=F('pub_date')),
+                default=Value(None),
+                output_field=models.DateTimeField(),
+            ),
+        )
+
+
+class Post(SoftDeletable, Publication):
     title = models.CharField("Заголовок", max_length=MAX_FIELD_LENGTH)
     text = models.TextField("Текст")
+    excerpt = models.TextField("Анонс", blank=True, editable=False)
     pub_date = models.DateTimeField(
         "Дата и время публикации",
         default=timezone.now,
@@ -83,18 +133,82 @@ class Post(Publication):
         Category,
         null=True, on_delete=models.SET_NULL, verbose_name="Категория"
     )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0, editable=False
+    )
+    is_visible = models.BooleanField(
+        "Видна читателям", default=False, editable=False
+    )
+    pending_until = models.DateTimeField(
+        "Ожидает публикации до", null=True, blank=True, editable=False
+    )
+
+    objects = SoftDeleteManager.from_queryset(PostQuerySet)()
+    all_objects = models.Manager.from_queryset(PostQuerySet)()
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         default_related_name = "posts"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(fields=("author", "-pub_date"),
+                         name="post_author_timeline_idx"),
+            models.Index(fields=("is_visible", "-pub_date"),
+                         name="post_visible_feed_idx"),
+            models.Index(fields=("pending_until",),
+                         name="post_pending_until_idx"),
+            models.Index(fields=("-pub_date",), name="post_pub_date_idx"),
+            models.Index(fields=("deleted_at",),
+                         name="post_deleted_at_idx"),
+        )
 
     def __str__(self):
         return self.title[:REPRESENTATION_LENGTH]
 
+    @staticmethod
+    def make_excerpt(text):
+        return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+    def update_visibility(self, moment=None):
+        moment = moment or timezone.now()
+        ready = bool(self.is_published and self.deleted_at is None
+                     and self.category_id and self.category.is_published)
+        self.is_visible = ready and self.pub_date <= moment
+        self.pending_until = (
+            self.pub_date if ready and self.pub_date > moment else None)
+
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            self.excerpt = self.make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        visibility_fields = {
+            'is_published', 'pub_date', 'category', 'deleted_at'}
+        if not {'is_published', 'pub_date', 'category_id',
+                'deleted_at'} & self.get_deferred_fields():
+            self.update_visibility()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and visibility_fields & {*update_fields}:
+            kwargs['update_fields'] = {
+                *update_fields, 'is_visible', 'pending_until'}
+        # Счётчик комментариев обновляется только через F-выражения,
+        # поэтому обычное сохранение не должно перезаписывать его.
+        # Отложенные поля (only/defer) тоже не пишем: иначе каждое из них
+        # подгрузится отдельным запросом.
+        if (not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None):
+            skipped = {'comment_count', *self.get_deferred_fields()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+                and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
 
-class Comment(Publication):
+
+class Comment(SoftDeletable, Publication):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -109,13 +223,38 @@ class Comment(Publication):
     )
     text = models.TextField(verbose_name='Текст комментария')
 
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['created_at'],
+                         name='comment_created_at_idx'),
+            models.Index(fields=['deleted_at'],
+                         name='comment_deleted_at_idx'),
+        ]
 
     def __str__(self) -> str:
         return (f'Комментарий автора {self.author.username}'
                 f'к посту {self.post.title},'
                 f'текст: {self.text[:MAX_COMMENT_LENGTH]}'
                 )
+
+
+class Lease(models.Model):
+    # Аренда в базе видна всем процессам и машинам, в отличие от кэша
+    # в памяти процесса.
+    name = models.CharField(
+        "Название", max_length=MAX_FIELD_LENGTH, primary_key=True)
+    token = models.CharField("Владелец", max_length=32)
+    expires_at = models.DateTimeField("Действует до")
+
+    class Meta:
+        verbose_name = "аренда"
+        verbose_name_plural = "Аренды"
+
+    def __str__(self):
+        return self.name
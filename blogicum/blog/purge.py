@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
+from constants.constants import CACHE_PURGE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+def post_urls(post_id, category_slug=None, username=None):
+    urls = [reverse('blog:index'),
+            reverse('blog:post_detail', kwargs={'post_id': post_id})]
+    if category_slug:
+        urls.append(reverse('blog:category_posts',
+                            kwargs={'category_slug': category_slug}))
+    if username:
+        urls.append(reverse('blog:profile', kwargs={'username': username}))
+    return urls
+
+
+def category_urls(category):
+    return [reverse('blog:index'),
+            reverse('blog:category_posts',
+                    kwargs={'category_slug': category.slug})]
+
+
+def feed_wildcard_urls():
+    # Для крупных массовых изменений сбрасываем ленты и страницы постов
+    # целиком: CDN понимает шаблон со звёздочкой в конце пути.
+    index = reverse('blog:index')
+    return [index] + [f'{index}{prefix}/*'
+                      for prefix in ('posts', 'category', 'profile')]
+
+
+def send_purge(urls):
+    backend = settings.CACHE_PURGE_BACKEND
+    if backend == 'log':
+        with open(settings.CACHE_PURGE_LOG, 'a', encoding='utf-8') as log:
+            for url in urls:
+                log.write(f'{time.time():.3f} PURGE {url}\n')
+    elif backend == 'http':
+        # urllib.request тянет за собой http.client и email: импортируем
+        # только там, где сброс действительно идёт по HTTP.
+        import urllib.request
+
+        for url in urls:
+            request = urllib.request.Request(
+                settings.CACHE_PURGE_URL.rstrip('/') + url, method='PURGE')
+            try:
+                urllib.request.urlopen(request, timeout=CACHE_PURGE_TIMEOUT)
+            except OSError as error:
+                logger.warning('Не удалось сбросить кэш %s: %s', url, error)
+
+
+class PurgeQueue:
+    """Очередь сброса по HTTP, которую разбирает фоновый поток процесса.
+
+    Запрос, изменивший данные, не ждёт ответов CDN; адреса, уже стоящие
+    в очереди, повторно не добавляются.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._ready = threading.Condition()
+        self._pid = None
+
+    def put(self, urls):
+        with self._ready:
+            self._pending.update(dict.fromkeys(urls))
+            # После fork потока в дочернем процессе нет: запускаем заново.
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, daemon=True).start()
+            self._ready.notify()
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._pending:
+                    self._ready.wait()
+                urls = list(self._pending)
+                self._pending.clear()
+            send_purge(urls)
+
+
+purge_queue = PurgeQueue()
+
+
+def purge_enabled():
+    return bool(settings.CACHE_PURGE_BACKEND)
+
+
+def dispatch_purge(urls):
+    if settings.CACHE_PURGE_BACKEND == 'http':
+        purge_queue.put(urls)
+    else:
+        send_purge(urls)
+
+
+def purge(urls):
+    if purge_enabled() and urls:
+        urls = list(dict.fromkeys(urls))
+        transaction.on_commit(lambda: dispatch_purge(urls))
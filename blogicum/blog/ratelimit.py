@@ -0,0 +1,75 @@
+import math
+import time
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .cache import LRUCache
+
+from constants.constants import RATE_LIMIT_LOCAL_KEYS
+
+try:
+    from pymemcache.exceptions import MemcacheError
+except ImportError:
+    CACHE_ERRORS = (OSError,)
+else:
+    CACHE_ERRORS = (OSError, MemcacheError)
+
+
+class FixedWindowLimiter:
+    def __init__(self, alias=None, local_keys=RATE_LIMIT_LOCAL_KEYS):
+        self.alias = alias
+        self.local = LRUCache(local_keys)
+        self._lock = Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias or settings.RATELIMIT_CACHE_ALIAS]
+
+    @staticmethod
+    def retry_after(period):
+        return math.ceil(period - time.time() % period) or 1
+
+    def _hit_shared(self, cache_key, period):
+        cache = self.shared
+        # add и incr атомарны только в memcached: файловый кэш выполняет
+        # их как чтение и запись, и под нагрузкой параллельные запросы
+        # могут недосчитаться. Для строгих лимитов нужен memcached.
+        cache.add(cache_key, 0, period)
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            # Ключ вытеснили между add и incr.
+            cache.set(cache_key, 1, period)
+            return 1
+
+    def _hit_local(self, cache_key):
+        with self._lock:
+            count = self.local.get(cache_key, 0) + 1
+            self.local.set(cache_key, count)
+        return count
+
+    def allow(self, key, capacity, period):
+        window = int(time.time() // period)
+        cache_key = f'ratelimit:{key}:{window}'
+        try:
+            count = self._hit_shared(cache_key, period)
+        except CACHE_ERRORS:
+            # Общий кэш недоступен: ограничиваем в пределах процесса.
+            count = self._hit_local(cache_key)
+        return count <= capacity
+
+
+def client_ip(request):
+    # Каждый доверенный прокси дописывает в X-Forwarded-For адрес, от
+    # которого получил запрос; всё левее может подделать сам клиент.
+    proxies = settings.RATELIMIT_TRUSTED_PROXIES
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR')
+
+
+rate_limiter = FixedWindowLimiter()
@@ -0,0 +1,65 @@
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import Lease, Post
+from .signals import posts_bulk_changed
+
+from constants.constants import SCHEDULER_BATCH_SIZE, SCHEDULER_LEASE_TIMEOUT
+
+LEASE_NAME = 'publish_scheduled'
+
+
+def acquire_lease(timeout=SCHEDULER_LEASE_TIMEOUT):
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=timeout)
+    try:
+        with transaction.atomic():
+            Lease.objects.create(
+                name=LEASE_NAME, token=token, expires_at=expires_at)
+        return token
+    except IntegrityError:
+        pass
+    # Просроченную аренду забирает ровно один обработчик: условный UPDATE
+    # атомарен, и второй уже не найдёт строку с истёкшим сроком.
+    taken = Lease.objects.filter(
+        name=LEASE_NAME, expires_at__lte=now
+    ).update(token=token, expires_at=expires_at)
+    return token if taken else None
+
+
+def release_lease(token):
+    Lease.objects.filter(name=LEASE_NAME, token=token).delete()
+
+
+def promote_batch(moment, batch_size=SCHEDULER_BATCH_SIZE):
+    with transaction.atomic():
+        due = Post.objects.filter(
+            pending_until__lte=moment).order_by('pending_until')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True, of=('self',))
+        rows = list(due.values_list(
+            'pk', 'category__slug', 'author__username')[:batch_size])
+        if not rows:
+            return 0
+        # Условие на pending_until делает захват идемпотентным: строку,
+        # уже переключённую другим обработчиком, повторно не тронем.
+        promoted = Post.objects.filter(
+            pk__in=[pk for pk, *_ in rows], pending_until__lte=moment
+        ).update(is_visible=True, pending_until=None)
+        if promoted:
+            posts_bulk_changed.send(sender=Post, rows=rows)
+    return promoted
+
+
+def promote_due_posts(batch_size=SCHEDULER_BATCH_SIZE, moment=None):
+    moment = moment or timezone.now()
+    total = 0
+    while True:
+        promoted = promote_batch(moment, batch_size)
+        total += promoted
+        if promoted < batch_size:
+            return total
@@ -0,0 +1,76 @@
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+# Полнотекстовые индексы SQLite (FTS5) по текстовым полям моделей.
+FTS_FIELDS = {
+    'blog_post': ('title', 'text'),
+    'blog_comment': ('text',),
+}
+
+
+def fts_available(using=connection):
+    if using.vendor != 'sqlite':
+        return False
+    with using.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def ensure_fts_tables(using=connection):
+    """Создаёт FTS-таблицы и триггеры, если их нет.
+
+    Вызывается после каждой миграции: SQLite пересоздаёт таблицу при
+    изменении схемы, и триггеры на ней теряются.
+    """
+    if not fts_available(using):
+        return
+    with using.cursor() as cursor:
+        for table, fields in FTS_FIELDS.items():
+            fts = f'{table}_fts'
+            columns = ', '.join(fields)
+            new = ', '.join(f'new.{field}' for field in fields)
+            old = ', '.join(f'old.{field}' for field in fields)
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master "
+                "WHERE type = 'trigger' AND tbl_name = %s "
+                "AND name LIKE %s", [table, f'{fts}_%'])
+            if cursor.fetchone()[0] == 3:
+                continue
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+                f"{columns}, content='{table}', content_rowid='id')")
+            for statement in (
+                f'DROP TRIGGER IF EXISTS {fts}_ai',
+                f'DROP TRIGGER IF EXISTS {fts}_ad',
+                f'DROP TRIGGER IF EXISTS {fts}_au',
+                f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+                f'INSERT INTO {fts}(rowid, {columns}) '
+                f'VALUES (new.id, {new}); END',
+                f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+                f'INSERT INTO {fts}({fts}, rowid, {columns}) '
+                f"VALUES ('delete', old.id, {old}); END",
+                f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} '
+                f'ON {table} BEGIN '
+                f'INSERT INTO {fts}({fts}, rowid, {columns}) '
+                f"VALUES ('delete', old.id, {old}); "
+                f'INSERT INTO {fts}(rowid, {columns}) '
+                f'VALUES (new.id, {new}); END',
+            ):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def fts_query(term):
+    # Каждое слово берём в кавычки, чтобы пользовательский ввод
+    # не разбирался как синтаксис запросов FTS5.
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in term.split())
+
+
+def full_text_search(queryset, term):
+    table = queryset.model._meta.db_table
+    if table not in FTS_FIELDS or not fts_available():
+        return None
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s',
+        [fts_query(term)]))
@@ -1,7 +1,10 @@
 from django.core.paginator import Paginator
-from django.utils.timezone import now
+from django.shortcuts import get_object_or_404
 
-from .models import Post
+from .bloom import username_filter
+from .cache import (CachedNotFound, cache_is_on_disk, cache_is_shared,
+                    lookup_cache)
+from .models import Category, Post, User
 
 from constants.constants import AMOUNT_POSTS
 
@@ -9,12 +12,73 @@ from constants.constants import AMOUNT_POSTS
 def get_published_posts():
     return Post.objects.select_related(
         "author", "category", "location"
-    ).filter(
-        is_published=True, pub_date__lt=now(), category__is_published=True
-    )
+    ).visible()
+
+
+FEED_FIELDS = (
+    'id', 'title', 'excerpt', 'image', 'pub_date', 'is_published',
+    'comment_count', 'author', 'category', 'location',
+    'author__username',
+    'category__slug', 'category__title', 'category__is_published',
+    'location__name', 'location__is_published',
+)
+
+
+def project_feed(posts):
+    return posts.select_related(
+        'author', 'category', 'location'
+    ).only(*FEED_FIELDS)
+
+
+def get_feed_posts():
+    return project_feed(get_published_posts())
+
+
+def get_author_posts(author, include_hidden=False):
+    # Лента автора идёт по индексу (author, pub_date) без join с категориями.
+    posts = Post.objects.filter(author=author)
+    if not include_hidden:
+        posts = posts.visible()
+    return project_feed(posts.order_by('-pub_date'))
 
 
 def paginate_posts(request, posts):
     paginator = Paginator(posts, AMOUNT_POSTS)
     page = request.GET.get('page')
     return paginator.get_page(page)
+
+
+def get_post(post_id):
+    return lookup_cache.get_or_load(
+        'post', post_id,
+        lambda: get_object_or_404(
+            Post.objects.select_related(
+                'author', 'category', 'location').defer('author__password'),
+            id=post_id
+        )
+    )
+
+
+def get_category(category_slug):
+    return lookup_cache.get_or_load(
+        'category', category_slug,
+        lambda: get_object_or_404(
+            Category, slug=category_slug, is_published=True)
+    )
+
+
+def get_author(username):
+    # Отсутствие в фильтре окончательно, только если версия фильтра лежит
+    # в общем кэше: иначе процесс не узнает о пользователях, созданных
+    # другими воркерами, и решение остаётся за базой.
+    if cache_is_shared() and not username_filter.might_exist(username):
+        raise CachedNotFound
+
+    # Хэш пароля в кэш не попадает, а личные данные не пишем на диск.
+    def load():
+        return get_object_or_404(
+            User.objects.defer('password'), username=username)
+
+    if cache_is_on_disk():
+        return load()
+    return lookup_cache.get_or_load('user', username, load)
@@ -0,0 +1,153 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import Signal, receiver
+
+from .backends import forget_auth_user
+from .bloom import username_filter
+from .cache import lookup_cache
+from .models import Category, Comment, Location, Post, User
+from .purge import (category_urls, feed_wildcard_urls, post_urls, purge,
+                    purge_enabled)
+
+from constants.constants import CACHE_PURGE_BULK_LIMIT
+
+LOOKUP_DEPENDENCIES = {
+    Category: ('category', 'post'),
+    Location: ('post',),
+    Post: ('post',),
+    User: ('user',),
+}
+
+# Одно событие на массовое изменение постов вместо сигналов по строкам;
+# rows — кортежи (pk, category_slug, username) затронутых постов.
+posts_bulk_changed = Signal()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_lookups(sender, **kwargs):
+    namespaces = LOOKUP_DEPENDENCIES.get(sender)
+    if namespaces:
+        # Версию меняем после коммита: иначе параллельный запрос успеет
+        # перечитать старые данные и закэшировать их под новой версией.
+        transaction.on_commit(lambda: lookup_cache.invalidate(*namespaces))
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Мягко удалённый комментарий уже вычтен из счётчика.
+    if instance.deleted_at is None:
+        Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def soft_delete_comment_count(sender, instance, update_fields=None,
+                              **kwargs):
+    if update_fields and 'deleted_at' in update_fields:
+        Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_visibility(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    posts = Post.objects.filter(category=instance)
+    # Пересчитываем только посты, чьё состояние расходится с категорией.
+    if instance.is_published:
+        posts = posts.filter(is_published=True, is_visible=False,
+                             pending_until__isnull=True)
+    else:
+        posts = posts.filter(
+            Q(is_visible=True) | Q(pending_until__isnull=False))
+    posts.refresh_visibility()
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    # Посты останутся без категории (SET_NULL) и должны пропасть из лент.
+    Post.objects.filter(category=instance).update(
+        is_visible=False, pending_until=None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_user(sender, instance, **kwargs):
+    forget_auth_user(instance.pk)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    instance._saved_username = None
+    if instance.pk and (update_fields is None or 'username' in update_fields):
+        instance._saved_username = User.objects.filter(
+            pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def update_username_filter(sender, instance, created, **kwargs):
+    old = getattr(instance, '_saved_username', None)
+    username = instance.username
+    # Версию фильтра меняем только после коммита: иначе другой процесс
+    # перестроит фильтр по данным до коммита и примет его за свежий.
+    if created:
+        transaction.on_commit(lambda: username_filter.added(username))
+    elif old and old != username:
+        def rename():
+            username_filter.added(username)
+            username_filter.removed(old)
+
+        transaction.on_commit(rename)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_username_filter(sender, instance, **kwargs):
+    username = instance.username
+    transaction.on_commit(lambda: username_filter.removed(username))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_pages(sender, instance, raw=False, **kwargs):
+    if raw or not purge_enabled():
+        return
+    category = instance.category
+    purge(post_urls(instance.pk, category.slug if category else None,
+                    instance.author.username))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_pages(sender, instance, raw=False, **kwargs):
+    if raw or not purge_enabled():
+        return
+    post = Post.objects.filter(pk=instance.post_id).values(
+        'category__slug', 'author__username').first() or {}
+    purge(post_urls(instance.post_id, post.get('category__slug'),
+                    post.get('author__username')))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def purge_category_pages(sender, instance, raw=False, **kwargs):
+    if not raw and purge_enabled():
+        purge(category_urls(instance))
+
+
+@receiver(posts_bulk_changed)
+def invalidate_bulk_posts(sender, rows, **kwargs):
+    transaction.on_commit(lambda: lookup_cache.invalidate('post'))
+    if len(rows) > CACHE_PURGE_BULK_LIMIT:
+        purge(feed_wildcard_urls())
+    else:
+        purge([url for row in rows for url in post_urls(*row)])
@@ -0,0 +1,134 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+from collections import defaultdict
+
+# Выполняется в отдельном процессе под `python -X importtime`: замеряет
+# этапы запуска и печатает их в stdout одной строкой JSON.
+PROFILE_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+phases = {}
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+phases['settings'] = time.perf_counter() - started
+mark = time.perf_counter()
+django.setup()
+phases['apps_ready'] = time.perf_counter() - mark
+mark = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases['urlconf'] = time.perf_counter() - mark
+mark = time.perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+phases['middleware'] = time.perf_counter() - mark
+mark = time.perf_counter()
+from blog.startup import warm_templates
+warm_templates()
+phases['templates'] = time.perf_counter() - mark
+phases['total'] = time.perf_counter() - started
+print(json.dumps(phases))
+'''
+
+WARM_TEMPLATES = (
+    'base.html',
+    'blog/index.html',
+    'blog/detail.html',
+    'blog/profile.html',
+    'registration/login.html',
+)
+
+
+def parse_importtime(lines):
+    modules = []
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split(
+            '|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def group_by_package(modules):
+    totals = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[name.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile_startup(settings_module):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+        capture_output=True, text=True, env=env, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    return phases, parse_importtime(result.stderr.splitlines())
+
+
+def warm_templates():
+    from django.template.loader import get_template
+
+    for name in WARM_TEMPLATES:
+        get_template(name)
+
+
+def warm_up():
+    from django.db import connections
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    warm_templates()
+    # Соединения не должны достаться дочерним процессам по наследству.
+    connections.close_all()
+
+
+class PreforkServer:
+    """Раздаёт уже прогретое приложение из нескольких дочерних процессов.
+
+    Все процессы принимают соединения на одном сокете; упавший
+    процесс заменяется новым форком без повторного импорта.
+    """
+
+    def __init__(self, server, workers):
+        self.server = server
+        self.workers = workers
+        self.children = set()
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                self.server.serve_forever()
+            finally:
+                os._exit(0)
+        self.children.add(pid)
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+        while self.children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            self.children.discard(pid)
+            if not self.stopping:
+                self.spawn()
+        self.server.server_close()
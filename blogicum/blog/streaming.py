@@ -0,0 +1,27 @@
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+COMMENTS_PLACEHOLDER = mark_safe('<!-- comments -->')
+
+
+def stream_post_detail(request, context):
+    # Токен запрашивается заранее: cookie CSRF выставляется до того,
+    # как будет отрисована форма комментария. Анонимам форму не
+    # показывают, и cookie им не нужна.
+    if request.user.is_authenticated:
+        get_token(request)
+    page = render_to_string(
+        'blog/detail.html',
+        {**context, 'comments_placeholder': COMMENTS_PLACEHOLDER},
+        request
+    )
+    head, tail = page.split(COMMENTS_PLACEHOLDER, 1)
+
+    def content():
+        yield head
+        yield render_to_string('includes/comments.html', context, request)
+        yield tail
+
+    return StreamingHttpResponse(content())
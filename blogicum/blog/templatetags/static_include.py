@@ -0,0 +1,35 @@
+from django import template
+from django.template.loader_tags import IncludeNode, do_include
+
+register = template.Library()
+
+
+class StaticIncludeNode(IncludeNode):
+    def __init__(self, compiled, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compiled = compiled
+
+    def render(self, context):
+        values = {
+            name: var.resolve(context)
+            for name, var in self.extra_context.items()
+        }
+        if self.isolated_context:
+            return self.compiled.render(context.new(values))
+        with context.push(**values):
+            return self.compiled.render(context)
+
+
+@register.tag('include')
+def static_include(parser, token):
+    node = do_include(parser, token)
+    name = node.template.var
+    loader = getattr(parser.origin, 'loader', None)
+    if not isinstance(name, str) or node.template.filters or loader is None:
+        return node
+    return StaticIncludeNode(
+        loader.engine.get_template(name),
+        node.template,
+        extra_context=node.extra_context,
+        isolated_context=node.isolated_context,
+    )
@@ -1,21 +1,31 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
-from django.http import Http404
-from django.shortcuts import get_object_or_404, render
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from .batching import comment_batcher
+from .cache_policy import cache_policy
 from .forms import (CommentForm, PostForm, UserProfileForm)
-from .mixins import (AutRequiredMixin, AuthorRequiredMixin, PostListMixin)
-from .models import (Category, Comment, Post, User)
-from .service import (get_published_posts, paginate_posts)
+from .mixins import (AutRequiredMixin, AuthorRequiredMixin,
+                     CommentAuthorMixin, PostListMixin, RateLimitMixin,
+                     SoftDeleteMixin)
+from .models import (Comment, Post, User)
+from .service import (get_author, get_author_posts, get_category,
+                      get_feed_posts, get_post, paginate_posts)
+from .streaming import stream_post_detail
 
+from constants.constants import (COMMENT_RATE_LIMIT, FEED_MAX_AGE,
+                                 FEED_STALE_WHILE_REVALIDATE, POST_RATE_LIMIT)
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+
+class PostCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
+    ratelimit = POST_RATE_LIMIT
 
     def get_success_url(self):
         return reverse('blog:profile',
@@ -38,7 +48,8 @@ class EditPostView(LoginRequiredMixin,
         return reverse('blog:post_detail', args=(self.object.pk,))
 
 
-class DeletePostView(LoginRequiredMixin, AutRequiredMixin, DeleteView):
+class DeletePostView(LoginRequiredMixin, AutRequiredMixin, SoftDeleteMixin,
+                     DeleteView):
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
@@ -61,27 +72,15 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
                        kwargs={'username': self.request.user.username})
 
 
+@method_decorator(cache_policy(FEED_MAX_AGE, FEED_STALE_WHILE_REVALIDATE),
+                  name='dispatch')
 class UserProfileView(PostListMixin, ListView):
     template_name = 'blog/profile.html'
-    context_object_name = 'page_obj'
 
     def get_queryset(self):
-        self.author = get_object_or_404(User,
-                                        username=self.kwargs.get('username'))
-        if self.request.user == self.author:
-            return super().get_queryset().select_related('author',
-                                                         'category',
-                                                         'location').filter(
-                author=self.author
-            )
-        return super().get_queryset().select_related('author',
-                                                     'category',
-                                                     'location').filter(
-            author=self.author,
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True
-        )
+        self.author = get_author(self.kwargs.get('username'))
+        return get_author_posts(
+            self.author, include_hidden=self.request.user == self.author)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -89,20 +88,17 @@ class UserProfileView(PostListMixin, ListView):
         return context
 
 
+@cache_policy(FEED_MAX_AGE, FEED_STALE_WHILE_REVALIDATE)
 def index(request):
-    post_db = get_published_posts().annotate(
-        comments_count=Count('comments')
-    ).order_by('-pub_date')
+    post_db = get_feed_posts().order_by('-pub_date')
     page_obj = paginate_posts(request, post_db)
     return render(request, "blog/index.html", {"page_obj": page_obj})
 
 
+@cache_policy(FEED_MAX_AGE, FEED_STALE_WHILE_REVALIDATE)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post.objects.select_related('author', 'category'),
-                             id=post_id)
-    if (not post.is_published
-            or not post.category.is_published
-            or post.pub_date > timezone.now()) and post.author != request.user:
+    post = get_post(post_id)
+    if not post.is_visible and post.author != request.user:
         raise Http404("Post not found")
     comments = post.comments.all().order_by('created_at')
     form = CommentForm()
@@ -111,60 +107,50 @@ def post_detail(request, post_id):
         'comments': comments,
         'form': form
     }
+    if settings.STREAM_POST_DETAIL:
+        return stream_post_detail(request, context)
     return render(request, 'blog/detail.html', context)
 
 
+@cache_policy(FEED_MAX_AGE, FEED_STALE_WHILE_REVALIDATE)
 def category_posts(request, category_slug):
-    category = get_object_or_404(
-        Category, slug=category_slug, is_published=True)
-    post_list = get_published_posts().filter(category=category).annotate(
-        comments_count=Count('comments')
-    ).order_by('-pub_date')
+    category = get_category(category_slug)
+    post_list = get_feed_posts().filter(
+        category=category).order_by('-pub_date')
     page_obj = paginate_posts(request, post_list)
     return render(request,
                   "blog/category.html",
                   {"category": category, "page_obj": page_obj})
 
 
-class EditCommentView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditCommentView(LoginRequiredMixin, CommentAuthorMixin,
+                      UserPassesTestMixin, UpdateView):
     model = Comment
     fields = ['text']
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def get_success_url(self):
-        comment = self.get_object()
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': comment.post.pk})
-
-    def test_func(self):
-        comment = self.get_object()
-        return self.request.user == comment.author
 
-
-class DeleteCommentView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteCommentView(LoginRequiredMixin, CommentAuthorMixin,
+                        UserPassesTestMixin, SoftDeleteMixin, DeleteView):
     model = Comment
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def get_success_url(self):
-        post_id = self.kwargs.get('post_id')
-        return reverse('blog:post_detail', kwargs={'post_id': post_id})
-
-    def test_func(self):
-        comment = self.get_object()
-        return self.request.user == comment.author
-
 
-class AddCommentView(LoginRequiredMixin, CreateView):
+class AddCommentView(LoginRequiredMixin, RateLimitMixin, CreateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
+    ratelimit = COMMENT_RATE_LIMIT
 
     def form_valid(self, form):
-        post_obj = get_object_or_404(Post, pk=self.kwargs.get('post_id'))
+        post_obj = get_post(self.kwargs.get('post_id'))
         form.instance.post = post_obj
         form.instance.author = self.request.user
+        if settings.COMMENT_WRITE_BEHIND:
+            self.object = comment_batcher.submit(form.instance)
+            return HttpResponseRedirect(self.get_success_url())
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -34,23 +35,60 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'blog.middleware.CompressionMiddleware',
+    'blog.middleware.AnonymousFastPathMiddleware',
+    # Снаружи сессий и CSRF: политика кэширования видит их cookies.
+    'blog.middleware.CachePolicyMiddleware',
+    'blog.middleware.FastPathSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.middleware.FastPathAuthenticationMiddleware',
+    'blog.middleware.FastPathMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.RequestRecorderMiddleware',
 ]
 
+REQUEST_LOG_PATH = os.getenv('REQUEST_LOG_PATH')
+
+ANONYMOUS_FAST_PATH_VIEWS = [
+    'blog:index',
+    'blog:category_posts',
+    'pages:about',
+    'pages:rules',
+]
+
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+
+CACHE_PURGE_BACKEND = os.getenv('CACHE_PURGE_BACKEND')
+CACHE_PURGE_LOG = BASE_DIR / 'purge.log'
+CACHE_PURGE_URL = os.getenv('CACHE_PURGE_URL', 'http://127.0.0.1:6081')
+
+PRERENDER_PAGES = os.getenv('PRERENDER_PAGES', 'False') == 'True'
+
+STREAM_POST_DETAIL = os.getenv('STREAM_POST_DETAIL', 'False') == 'True'
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+TEMPLATE_PROFILE = os.getenv('BLOGICUM_TEMPLATE_PROFILE', 'debug')
+
+TEMPLATE_PRODUCTION_OPTIONS = {
+    'loaders': [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ],
+    'builtins': ['blog.templatetags.static_include'],
+}
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
+        'APP_DIRS': TEMPLATE_PROFILE != 'production',
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -58,10 +96,31 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            **(TEMPLATE_PRODUCTION_OPTIONS
+               if TEMPLATE_PROFILE == 'production' else {}),
         },
     },
 ]
 
+TEMPLATE_ENGINE = os.getenv('BLOGICUM_TEMPLATE_ENGINE', 'django')
+
+JINJA2_TEMPLATES = {
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [TEMPLATES_DIR / 'jinja2'],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'environment': 'blog.jinja2.environment',
+        'context_processors': [
+            'django.template.context_processors.debug',
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}
+
+if TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.insert(0, JINJA2_TEMPLATES)
+
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 
@@ -78,6 +137,48 @@ DATABASES = {
     }
 }
 
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+    'memcached': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.getenv('MEMCACHED_LOCATION', '127.0.0.1:11211'),
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[os.getenv('BLOGICUM_CACHE', 'locmem')],
+}
+
+RATELIMIT_ENABLED = True
+RATELIMIT_CACHE_ALIAS = 'default'
+# Сколько доверенных обратных прокси стоит перед приложением: адрес клиента
+# берётся из X-Forwarded-For с учётом их числа, а без прокси — REMOTE_ADDR.
+RATELIMIT_TRUSTED_PROXIES = int(os.getenv('RATELIMIT_TRUSTED_PROXIES', '0'))
+
+COMMENT_WRITE_BEHIND = os.getenv('COMMENT_WRITE_BEHIND', 'False') == 'True'
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('BLOGICUM_SESSION_MODE', 'cache')]
+
+# ModelBackend остаётся в списке: его путь записан в уже открытых сессиях,
+# и без него все вошедшие пользователи были бы разлогинены.
+AUTHENTICATION_BACKENDS = [
+    'blog.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
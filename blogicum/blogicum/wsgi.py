@@ -5,3 +5,21 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from django.db import DatabaseError  # noqa: E402
+
+from blog.bloom import username_filter  # noqa: E402
+
+try:
+    username_filter.rebuild()
+except DatabaseError:
+    # База ещё не готова (например, до migrate): фильтр соберётся
+    # при первом обращении.
+    pass
+
+if settings.PRERENDER_PAGES:
+    from pages.prerender import prerender_all
+
+    prerender_all()
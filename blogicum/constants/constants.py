@@ -2,3 +2,30 @@ MAX_FIELD_LENGTH = 256
 REPRESENTATION_LENGTH = 20
 AMOUNT_POSTS = 10
 MAX_COMMENT_LENGTH = 30
+LOOKUP_CACHE_SIZE = 512
+LOOKUP_CACHE_TIMEOUT = 300
+LOOKUP_LOCAL_TIMEOUT = 5
+COMMENT_RATE_LIMIT = (10, 60)
+POST_RATE_LIMIT = (5, 60)
+IP_RATE_LIMIT_FACTOR = 5
+RATE_LIMIT_LOCAL_KEYS = 10000
+COMMENT_BATCH_SIZE = 50
+COMMENT_BATCH_DELAY = 0.02
+EXCERPT_WORDS = 10
+AUTH_USER_CACHE_TIMEOUT = 600
+STATIC_PAGE_MAX_AGE = 3600
+FEED_MAX_AGE = 60
+FEED_STALE_WHILE_REVALIDATE = 300
+CACHE_PURGE_TIMEOUT = 1
+CACHE_PURGE_BULK_LIMIT = 100
+NEGATIVE_CACHE_SIZE = 4096
+NEGATIVE_CACHE_TIMEOUT = 60
+USERNAME_FILTER_CAPACITY = 100000
+USERNAME_FILTER_ERROR_RATE = 0.01
+SCHEDULER_BATCH_SIZE = 500
+SCHEDULER_INTERVAL = 30
+SCHEDULER_LEASE_TIMEOUT = 120
+BULK_CHUNK_SIZE = 1000
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+ADMIN_COUNT_CACHE_TIMEOUT = 5 * 60
+SOFT_DELETE_RETENTION = 24 * 60 * 60
@@ -0,0 +1,55 @@
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+from django.utils.html import escape
+
+# Адрес запроса подставляется в уже отрисованную страницу при отдаче.
+URL_MARKER = '__prerendered_request_url__'
+
+PRERENDERED_PAGES = {
+    'pages/about.html': 'pages:about',
+    'pages/rules.html': 'pages:rules',
+    'pages/403csrf.html': None,
+    'pages/404.html': None,
+    'pages/500.html': None,
+}
+
+_pages = {}
+_lock = Lock()
+
+
+def render_anonymous(template_name, url_name=None):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = reverse(url_name) if url_name else '/'
+    request.resolver_match = resolve(request.path) if url_name else None
+    request.build_absolute_uri = lambda location=None: URL_MARKER
+    request.user = AnonymousUser()
+    return render_to_string(template_name, request=request).encode()
+
+
+def prerender_all():
+    with _lock:
+        for template_name, url_name in PRERENDERED_PAGES.items():
+            _pages[template_name] = render_anonymous(template_name, url_name)
+
+
+def can_serve_prerendered(request, force=False):
+    return ((settings.PRERENDER_PAGES or force)
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES)
+
+
+def serve_prerendered(request, template_name, status=200):
+    page = _pages.get(template_name)
+    if page is None:
+        page = render_anonymous(template_name,
+                                PRERENDERED_PAGES[template_name])
+        _pages[template_name] = page
+    if URL_MARKER.encode() in page:
+        page = page.replace(URL_MARKER.encode(),
+                            escape(request.build_absolute_uri()).encode())
+    return HttpResponse(page, status=status)
@@ -2,14 +2,32 @@
 from django.views.generic import TemplateView
 from django.http import HttpResponseForbidden
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 
+from blog.cache import CachedNotFound
+from blog.cache_policy import cache_policy
+from constants.constants import STATIC_PAGE_MAX_AGE
 
-class AboutView(TemplateView):
+from .prerender import can_serve_prerendered, serve_prerendered
+
+
+class PrerenderedPageMixin:
+    status = 200
+
+    def get(self, request, *args, **kwargs):
+        if can_serve_prerendered(request):
+            return serve_prerendered(request, self.template_name, self.status)
+        return super().get(request, *args, **kwargs)
+
+
+@method_decorator(cache_policy(STATIC_PAGE_MAX_AGE), name='dispatch')
+class AboutView(PrerenderedPageMixin, TemplateView):
     template_name = 'pages/about.html'
     view_class = TemplateView
 
 
-class RulesView(TemplateView):
+@method_decorator(cache_policy(STATIC_PAGE_MAX_AGE), name='dispatch')
+class RulesView(PrerenderedPageMixin, TemplateView):
     template_name = 'pages/rules.html'
     view_class = TemplateView
 
@@ -26,7 +44,7 @@ def csrf_failure(request, *args, **kwargs):
     return view(request, *args, **kwargs)
 
 
-class Custom403View(TemplateView):
+class Custom403View(PrerenderedPageMixin, TemplateView):
     template_name = 'pages/403csrf.html'
     status = 403
 
@@ -37,10 +55,13 @@ class Custom403View(TemplateView):
 
 
 def page_not_found(request, exception):
+    if can_serve_prerendered(
+            request, force=isinstance(exception, CachedNotFound)):
+        return serve_prerendered(request, 'pages/404.html', status=404)
     return render(request, 'pages/404.html', status=404)
 
 
-class Custom404View(TemplateView):
+class Custom404View(PrerenderedPageMixin, TemplateView):
     template_name = 'pages/404.html'
     status = 404
 
@@ -50,7 +71,7 @@ class Custom404View(TemplateView):
         return response
 
 
-class Custom500View(TemplateView):
+class Custom500View(PrerenderedPageMixin, TemplateView):
     template_name = 'pages/500.html'
     status = 500
 
@@ -33,6 +33,7 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "deleted_at",
             "refresh_from_db",
         ]
 
@@ -0,0 +1,169 @@
+import pytest
+from django.db.models.signals import post_save
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/post/"
+
+
+def test_publish_action_updates_all_pages_without_row_signals(
+        admin_client, mixer, user, published_category):
+    mixer.cycle(5).blend("blog.Post", author=user, is_published=False,
+                         category=published_category)
+    saved = []
+
+    def on_save(sender, **kwargs):
+        saved.append(kwargs["instance"])
+
+    post_save.connect(on_save, sender=Post)
+    try:
+        response = admin_client.post(CHANGELIST_URL, {
+            "action": "publish", "select_across": "1", "index": "0",
+            "_selected_action": [Post.objects.first().pk],
+        })
+    finally:
+        post_save.disconnect(on_save, sender=Post)
+    assert response.status_code == 302
+    assert Post.objects.filter(is_published=True, is_visible=True).count() == 5
+    assert not saved, (
+        "Убедитесь, что массовые действия не сохраняют посты по одному."
+    )
+
+
+def test_recategorize_action_asks_for_category(admin_client, mixer, user):
+    old, new = mixer.cycle(2).blend("blog.Category", is_published=True)
+    post = mixer.blend("blog.Post", author=user, category=old)
+    data = {"action": "recategorize", "select_across": "0", "index": "0",
+            "_selected_action": [post.pk]}
+    response = admin_client.post(CHANGELIST_URL, data)
+    assert response.status_code == 200
+    assert "Выбрано публикаций: 1" in response.content.decode("utf-8")
+
+    response = admin_client.post(
+        CHANGELIST_URL, {**data, "category": new.pk, "apply": "1"})
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.category == new, (
+        "Убедитесь, что действие переносит посты в выбранную категорию."
+    )
+
+
+def test_post_search_uses_full_text_index(admin_client, mixer, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    mixer.blend("blog.Post", author=user, text="про редкого тушканчика")
+    mixer.blend("blog.Post", author=user, text="обычный текст")
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get(CHANGELIST_URL, {"q": "тушканчика"})
+    content = response.content.decode("utf-8")
+    assert "про редкого тушканчика" in content
+    assert "обычный текст" not in content
+    assert any("blog_post_fts" in query["sql"]
+               for query in ctx.captured_queries), (
+        "Убедитесь, что поиск в админке использует полнотекстовый индекс."
+    )
+
+
+def test_changelist_uses_estimated_count(admin_client, mixer, user,
+                                         monkeypatch):
+    from blog import admin
+
+    monkeypatch.setattr(admin, "ADMIN_ESTIMATED_COUNT_THRESHOLD", 0)
+    mixer.cycle(3).blend("blog.Post", author=user)
+    response = admin_client.get(CHANGELIST_URL)
+    assert response.context["cl"].result_count == 3
+    mixer.blend("blog.Post", author=user)
+    response = admin_client.get(CHANGELIST_URL)
+    assert response.context["cl"].result_count == 3, (
+        "Убедитесь, что выше порога админка берёт число строк из"
+        " периодически обновляемого кэша, а не из полного COUNT."
+    )
+
+
+def test_spam_deletion_issues_one_delete_per_post(admin_client, mixer, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    posts = mixer.cycle(2).blend("blog.Post", author=user)
+    for post in posts:
+        mixer.cycle(4).blend("blog.Comment", author=user, post=post)
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.post("/admin/blog/comment/", {
+            "action": "delete_spam", "select_across": "1", "index": "0",
+            "_selected_action": [posts[0].comments.first().pk],
+        })
+    assert response.status_code == 302
+    deletes = [query for query in ctx.captured_queries
+               if query["sql"].startswith('DELETE FROM "blog_comment"')]
+    assert len(deletes) == 2, (
+        "Убедитесь, что спам удаляется одним запросом DELETE на пост."
+    )
+    for post in posts:
+        post.refresh_from_db()
+        assert post.comment_count == 0, (
+            "Убедитесь, что счётчик комментариев поста обновляется."
+        )
+
+
+def test_comment_filters_by_author(admin_client, mixer, user, another_user):
+    post = mixer.blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", author=user, post=post, text="свой")
+    mixer.blend("blog.Comment", author=another_user, post=post, text="чужой")
+    response = admin_client.get("/admin/blog/comment/",
+                                {"author": another_user.pk})
+    content = response.content.decode("utf-8")
+    assert "чужой" in content and "свой" not in content
+
+
+def test_comment_filter_lookups_are_cached(admin_client, mixer, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    post = mixer.blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", author=user, post=post)
+    admin_client.get("/admin/blog/comment/")
+    with CaptureQueriesContext(connection) as ctx:
+        admin_client.get("/admin/blog/comment/")
+    grouped = [query["sql"] for query in ctx.captured_queries
+               if "GROUP BY" in query["sql"]]
+    assert not grouped, (
+        "Убедитесь, что списки фильтров по автору и публикации берутся из"
+        " кэша, а не группируются при каждом показе."
+    )
+
+
+def test_bulk_update_purges_per_chunk_with_wildcard_fallback(
+        tmp_path, settings, monkeypatch, mixer, user, published_category,
+        django_capture_on_commit_callbacks):
+    from blog.bulk import bulk_update_posts
+    from blog.signals import posts_bulk_changed
+
+    settings.CACHE_PURGE_BACKEND = "log"
+    settings.CACHE_PURGE_LOG = tmp_path / "purge.log"
+    monkeypatch.setattr("blog.signals.CACHE_PURGE_BULK_LIMIT", 1)
+    posts = mixer.cycle(3).blend("blog.Post", author=user,
+                                 category=published_category)
+    sent = []
+
+    def on_bulk_change(sender, rows, **kwargs):
+        sent.append(len(rows))
+
+    posts_bulk_changed.connect(on_bulk_change)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            bulk_update_posts(Post.objects.order_by("pk"), chunk_size=2,
+                              is_published=False)
+    finally:
+        posts_bulk_changed.disconnect(on_bulk_change)
+    assert sent == [2, 1], (
+        "Убедитесь, что событие posts_bulk_changed отправляется по порциям."
+    )
+    purged = settings.CACHE_PURGE_LOG.read_text(encoding="utf-8")
+    assert "PURGE /posts/*\n" in purged, (
+        "Убедитесь, что крупные порции сбрасывают ленты по шаблону."
+    )
+    assert f"PURGE /posts/{posts[-1].pk}/\n" in purged
+    assert f"PURGE /posts/{posts[0].pk}/\n" not in purged
@@ -0,0 +1,90 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.bloom import CountingBloomFilter, username_filter
+
+
+def test_counting_bloom_filter_add_and_remove():
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    bloom.add("alice")
+    assert "alice" in bloom
+    bloom.remove("alice")
+    assert "alice" not in bloom, (
+        "Убедитесь, что удалённое имя пропадает из фильтра."
+    )
+    assert bloom.memory_footprint == bloom.size
+
+
+def test_counting_bloom_filter_error_rate():
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}")
+    false_positives = sum(f"other{i}" in bloom for i in range(10000))
+    assert false_positives < 300, (
+        "Убедитесь, что доля ложных срабатываний близка к заданной."
+    )
+
+
+@pytest.mark.django_db
+def test_unknown_profile_answered_without_database(client, user, monkeypatch):
+    monkeypatch.setattr("blog.service.cache_is_shared", lambda: True)
+    username_filter.filter = None
+    assert client.get(f"/profile/{user.username}/").status_code == 200
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/profile/no-such-user/")
+    assert response.status_code == 404
+    assert not ctx.captured_queries, (
+        "Убедитесь, что профиль несуществующего пользователя отдаёт 404"
+        " без обращения к базе данных."
+    )
+
+
+@pytest.mark.django_db
+def test_local_cache_falls_back_to_database(client, user):
+    username_filter.filter = None
+    assert client.get(f"/profile/{user.username}/").status_code == 200
+    get_user_model().objects.bulk_create(
+        [get_user_model()(username="from-other-worker")])
+    response = client.get("/profile/from-other-worker/")
+    assert response.status_code == 200, (
+        "Убедитесь, что при кэше в памяти процесса отрицательный ответ"
+        " фильтра проверяется по базе данных."
+    )
+
+
+@pytest.mark.django_db
+def test_username_filter_follows_user_changes(
+        client, mixer, django_capture_on_commit_callbacks, monkeypatch):
+    monkeypatch.setattr("blog.service.cache_is_shared", lambda: True)
+    assert client.get("/profile/newcomer/").status_code == 404
+    with django_capture_on_commit_callbacks(execute=True):
+        user = mixer.blend(get_user_model(), username="newcomer")
+    assert client.get("/profile/newcomer/").status_code == 200, (
+        "Убедитесь, что новый пользователь попадает в фильтр после коммита."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        user.username = "renamed"
+        user.save()
+    assert client.get("/profile/renamed/").status_code == 200
+    assert "newcomer" not in username_filter.filter, (
+        "Убедитесь, что старое имя удаляется из фильтра при переименовании."
+    )
+
+
+@pytest.mark.django_db
+def test_username_filter_version_changes_after_commit(
+        mixer, django_capture_on_commit_callbacks):
+    version = username_filter.shared_version()
+    assert version > 1, (
+        "Убедитесь, что начальная версия фильтра берётся от времени."
+    )
+    with django_capture_on_commit_callbacks() as callbacks:
+        mixer.blend(get_user_model(), username="pending")
+        assert username_filter.shared_version() == version, (
+            "Убедитесь, что версия фильтра меняется только после коммита."
+        )
+    for callback in callbacks:
+        callback()
+    assert username_filter.shared_version() != version
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+from django.test import override_settings
+
+from blog.batching import CommentBatcher
+
+
+def test_concurrent_comments_flushed_in_one_batch():
+    batches = []
+    batcher = CommentBatcher(max_batch=5, max_delay=1, flush=batches.append)
+    threads = [
+        threading.Thread(target=batcher.submit, args=(i,)) for i in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(batches) == 1, (
+        "Убедитесь, что одновременно отправленные комментарии записываются"
+        " одной пачкой."
+    )
+    assert sorted(batches[0]) == list(range(5))
+
+
+def test_flush_error_reaches_every_submitter():
+    def failing_flush(comments):
+        raise RuntimeError("flush failed")
+
+    batcher = CommentBatcher(max_batch=1, max_delay=0, flush=failing_flush)
+    with pytest.raises(RuntimeError):
+        batcher.submit(object())
+
+
+@pytest.mark.django_db
+def test_write_behind_comment_visible_after_redirect(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    with override_settings(COMMENT_WRITE_BEHIND=True):
+        response = user_client.post(
+            f"/posts/{post.id}/comment/", {"text": "Пакетный комментарий"},
+            follow=True
+        )
+    assert "Пакетный комментарий" in response.content.decode("utf-8")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев обновляется при пакетной записи."
+    )
+
+
+@pytest.mark.django_db
+def test_flushed_comments_purge_post_pages(
+        tmp_path, settings, django_capture_on_commit_callbacks, user,
+        post_with_published_location):
+    from blog.batching import flush_comments
+    from blog.models import Comment
+
+    post = post_with_published_location
+    settings.CACHE_PURGE_BACKEND = "log"
+    settings.CACHE_PURGE_LOG = tmp_path / "purge.log"
+    with django_capture_on_commit_callbacks(execute=True):
+        flush_comments([Comment(author=user, post=post, text="пачка")])
+    purged = settings.CACHE_PURGE_LOG.read_text(encoding="utf-8")
+    assert f"PURGE /posts/{post.id}/\n" in purged, (
+        "Убедитесь, что пакетная запись комментариев сбрасывает кэш"
+        " страницы поста."
+    )
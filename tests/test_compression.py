@@ -0,0 +1,50 @@
+import gzip
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_large_page_is_gzipped(client, post_with_published_location):
+    plain = client.get("/")
+    compressed = client.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert compressed["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed["Vary"]
+    assert gzip.decompress(compressed.content) == plain.content, (
+        "Убедитесь, что сжатый ответ распаковывается в исходную страницу."
+    )
+
+
+@override_settings(COMPRESSION_MIN_SIZE=10 ** 7)
+def test_page_below_threshold_is_not_compressed(client):
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+    assert not response.has_header("Content-Encoding")
+
+
+def test_streamed_detail_matches_rendered_detail(
+        user_client, post_with_published_location, mixer):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location,
+        text="Потоковый комментарий")
+    url = f"/posts/{post_with_published_location.id}/"
+    rendered = user_client.get(url)
+    with override_settings(STREAM_POST_DETAIL=True):
+        streamed = user_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert streamed.streaming
+    chunks = list(streamed.streaming_content)
+    html = gzip.decompress(b"".join(chunks)).decode("utf-8")
+    assert comment.text in html
+    assert html.count("<html") == 1 and html.rstrip().endswith("</html>")
+    assert len(html) == pytest.approx(len(rendered.content.decode()), abs=10)
+
+
+def test_streamed_detail_sets_no_csrf_cookie_for_anonymous(
+        client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    with override_settings(STREAM_POST_DETAIL=True):
+        response = client.get(url)
+    list(response.streaming_content)
+    assert "csrftoken" not in response.cookies, (
+        "Убедитесь, что анонимный потоковый ответ не выставляет cookie CSRF."
+    )
@@ -0,0 +1,42 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client, override_settings
+
+from blog.loadtest import (
+    InProcessTransport, percentile, read_request_log, replay)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_recorded_log_replays_in_process(tmp_path, user, post_with_published_location):
+    log_path = tmp_path / "requests.jsonl"
+    with override_settings(REQUEST_LOG_PATH=str(log_path)):
+        client = Client()
+        client.force_login(user)
+        client.get("/")
+        client.get(f"/posts/{post_with_published_location.id}/")
+        client.post(
+            f"/posts/{post_with_published_location.id}/comment/",
+            {"text": "Записанный комментарий"},
+        )
+
+    entries = list(read_request_log(log_path))
+    assert [entry["method"] for entry in entries] == ["GET", "GET", "POST"]
+    assert entries[2]["user"] == user.username
+    assert entries[2]["data"] == {"text": "Записанный комментарий"}
+
+    report = replay(entries, InProcessTransport(), concurrency=1)
+    summary = report.summary()
+    assert summary["requests"] == 3
+    assert summary["error_rate"] == 0
+    assert {row["url_name"] for row in report.rows()} == {
+        "blog:index", "blog:post_detail", "blog:add_comment"}
+
+    call_command("loadtest", str(log_path))
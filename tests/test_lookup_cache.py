@@ -0,0 +1,145 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import LRUCache, LookupCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") is None, (
+        "Убедитесь, что LRU-кэш вытесняет давно не использованную запись."
+    )
+    assert lru.get("a") == 1 and lru.get("c") == 3
+
+
+@pytest.mark.django_db
+def test_lookup_cache_counts_hits_and_misses():
+    cache = LookupCache(maxsize=8)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    for _ in range(3):
+        assert cache.get_or_load("test", "key", loader) == "value"
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["local_hits"] == 2
+
+    cache.local.clear()
+    cache.get_or_load("test", "key", loader)
+    assert cache.stats["shared_hits"] == 1
+
+    cache.invalidate("test")
+    cache.get_or_load("test", "key", loader)
+    assert len(calls) == 2, (
+        "Убедитесь, что смена версии пространства имён инвалидирует кэш."
+    )
+
+
+@pytest.mark.django_db
+def test_post_lookup_invalidated_on_save(
+        client, post_with_published_location,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    assert client.get(f"/posts/{post.id}/").status_code == 200
+    post.title = "Изменённый заголовок"
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    response = client.get(f"/posts/{post.id}/")
+    assert "Изменённый заголовок" in response.content.decode("utf-8"), (
+        "Убедитесь, что кэш публикаций сбрасывается при сохранении поста."
+    )
+
+
+@pytest.mark.django_db
+def test_missing_post_cached_until_post_created(
+        client, mixer, user, django_capture_on_commit_callbacks):
+    from blog.cache import lookup_cache
+
+    lookup_cache.clear()
+    missing_id = 10 ** 6
+    assert client.get(f"/posts/{missing_id}/").status_code == 404
+    assert lookup_cache.stats["negative_hits"] == 0
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/posts/{missing_id}/")
+    assert response.status_code == 404
+    assert lookup_cache.stats["negative_hits"] == 1
+    assert not ctx.captured_queries, (
+        "Убедитесь, что повторный запрос отсутствующего поста не обращается"
+        " к базе данных."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend("blog.Post", id=missing_id, author=user,
+                    category__is_published=True)
+    assert client.get(f"/posts/{missing_id}/").status_code == 200, (
+        "Убедитесь, что кэш отсутствующих объектов сбрасывается при"
+        " создании объекта."
+    )
+
+
+def test_local_entries_are_copies_and_expire(monkeypatch):
+    from blog import cache as cache_module
+
+    lru = LRUCache(maxsize=2, timeout=5)
+    lru.set("a", 1)
+    now = cache_module.monotonic()
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now + 10)
+    assert lru.get("a") is None, (
+        "Убедитесь, что записи локального LRU живут ограниченное время."
+    )
+
+
+@pytest.mark.django_db
+def test_lookup_cache_returns_copies():
+    cache = LookupCache(maxsize=8)
+    first = cache.get_or_load("test", "key", lambda: {"title": "старое"})
+    first["title"] = "изменено в запросе"
+    second = cache.get_or_load("test", "key", lambda: {})
+    assert second == {"title": "старое"}, (
+        "Убедитесь, что изменения объекта в одном запросе не попадают"
+        " в кэш процесса."
+    )
+
+
+@pytest.mark.django_db
+def test_cached_lookups_leave_out_password_hash(user, mixer):
+    from blog.service import get_author, get_post
+
+    post = mixer.blend("blog.Post", author=user)
+    get_author(user.username)
+    get_post(post.pk)
+    assert "password" in get_author(user.username).get_deferred_fields()
+    assert "password" in get_post(post.pk).author.get_deferred_fields(), (
+        "Убедитесь, что хэш пароля не попадает в кэш поиска."
+    )
+
+
+@pytest.mark.django_db
+def test_login_keeps_post_lookups(client, user,
+                                  django_capture_on_commit_callbacks):
+    from blog.cache import lookup_cache
+
+    version = lookup_cache.version("post")
+    with django_capture_on_commit_callbacks(execute=True):
+        client.force_login(user)
+    assert lookup_cache.version("post") == version, (
+        "Убедитесь, что сохранение пользователя не сбрасывает кэш постов."
+    )
+
+
+def test_process_local_cache_caps_lookup_timeouts(monkeypatch):
+    cache = LookupCache(timeout=300, local_timeout=5, negative_timeout=60)
+    assert cache.timeouts() == (5, 5), (
+        "Убедитесь, что при кэше в памяти процесса записи живут не дольше"
+        " локального уровня."
+    )
+    monkeypatch.setattr("blog.cache.cache_is_shared", lambda alias: True)
+    assert cache.timeouts() == (300, 60)
@@ -0,0 +1,96 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_get_skips_session_and_messages(client):
+    response = client.get("/")
+    request = response.wsgi_request
+    assert response.status_code == 200
+    assert request.anonymous_fast_path
+    assert isinstance(request.user, AnonymousUser)
+    assert not hasattr(request, "session"), (
+        "Убедитесь, что для анонимного GET-запроса без cookie сессии"
+        " сессия не создаётся."
+    )
+    assert not hasattr(request, "_messages")
+    assert "Войти" in response.content.decode("utf-8")
+
+
+def test_fast_path_not_used_with_session_cookie(user_client):
+    response = user_client.get("/")
+    request = response.wsgi_request
+    assert not request.anonymous_fast_path
+    assert request.user.is_authenticated
+
+
+def test_fast_path_not_used_for_other_views(client):
+    response = client.get("/auth/login/")
+    assert not response.wsgi_request.anonymous_fast_path
+    assert hasattr(response.wsgi_request, "session")
+
+
+def test_anonymous_feed_is_publicly_cacheable(client):
+    response = client.get("/")
+    cache_control = response["Cache-Control"]
+    assert "public" in cache_control and "max-age=" in cache_control
+    assert "stale-while-revalidate=" in cache_control
+    assert "Cookie" in response["Vary"]
+
+
+def test_authenticated_feed_is_private(user_client):
+    response = user_client.get("/")
+    assert "private" in response["Cache-Control"], (
+        "Убедитесь, что страницы для авторизованных пользователей не"
+        " кэшируются общими кэшами."
+    )
+    assert "public" not in response["Cache-Control"]
+
+
+def test_response_with_csrf_cookie_is_private(rf):
+    from django.http import HttpResponse
+    from django.middleware.csrf import CsrfViewMiddleware, get_token
+
+    from blog.cache_policy import cache_policy
+    from blog.middleware import CachePolicyMiddleware
+
+    @cache_policy(60)
+    def view(request):
+        return HttpResponse(get_token(request))
+
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    response = CachePolicyMiddleware(CsrfViewMiddleware(view))(request)
+    assert response.cookies
+    assert "private" in response["Cache-Control"], (
+        "Убедитесь, что ответы, выставляющие cookie CSRF, не кэшируются"
+        " общими кэшами."
+    )
+
+
+def test_post_save_writes_purge_log(
+        tmp_path, settings, django_capture_on_commit_callbacks, mixer, user,
+        published_category):
+    settings.CACHE_PURGE_BACKEND = "log"
+    settings.CACHE_PURGE_LOG = tmp_path / "purge.log"
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            "blog.Post", author=user, category=published_category)
+    purged = settings.CACHE_PURGE_LOG.read_text(encoding="utf-8")
+    for url in ("/", f"/posts/{post.id}/",
+                f"/category/{published_category.slug}/",
+                f"/profile/{user.username}/"):
+        assert f"PURGE {url}\n" in purged
+
+
+def test_http_purge_is_queued(settings, monkeypatch):
+    from blog import purge
+
+    settings.CACHE_PURGE_BACKEND = "http"
+    queued = []
+    monkeypatch.setattr(purge.purge_queue, "put", queued.append)
+    monkeypatch.setattr(purge, "send_purge", lambda urls: pytest.fail(
+        "Убедитесь, что сброс по HTTP не выполняется в запросе."))
+    purge.dispatch_purge(["/"])
+    assert queued == [["/"]]
@@ -0,0 +1,40 @@
+import pytest
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from pages.prerender import prerender_all
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def prerendered(settings):
+    settings.PRERENDER_PAGES = True
+    prerender_all()
+
+
+def test_prerendered_about_matches_rendered(client, settings):
+    rendered = client.get("/pages/about/").content
+    settings.PRERENDER_PAGES = True
+    prerender_all()
+    response = client.get("/pages/about/")
+    assert response.status_code == 200
+    assert response.content == rendered, (
+        "Убедитесь, что заранее отрисованная страница совпадает с обычной."
+    )
+
+
+def test_prerendered_404_is_served_without_queries(client, prerendered):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/no-such-page/<script>/")
+    assert response.status_code == 404
+    content = response.content.decode("utf-8")
+    assert "Страница не найдена" in content
+    assert "/no-such-page/%3Cscript%3E/" in content
+    assert "__prerendered_request_url__" not in content
+    assert not ctx.captured_queries
+
+
+def test_logged_in_user_gets_regular_page(user_client, user, prerendered):
+    content = user_client.get("/pages/rules/").content.decode("utf-8")
+    assert user.username in content
@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.bulk import purge_user
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_purge_user_deletes_content_in_chunks(mixer, user, another_user):
+    own_posts = mixer.cycle(3).blend("blog.Post", author=user)
+    other_post = mixer.blend("blog.Post", author=another_user)
+    mixer.cycle(3).blend("blog.Comment", author=user, post=other_post)
+    mixer.blend("blog.Comment", author=another_user, post=own_posts[0])
+
+    out = StringIO()
+    call_command("purge_user", user.username, "--chunk-size", "2", stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines == [
+        "Удалено комментариев: 2",
+        "Удалено комментариев: 3",
+        "Удалено постов: 2",
+        "Удалено постов: 3",
+        f"Пользователь {user.username} удалён.",
+    ], "Убедитесь, что очистка выводит прогресс по порциям."
+    assert not get_user_model().objects.filter(pk=user.pk).exists()
+    assert not Post.objects.filter(author_id=user.pk).exists()
+    assert not Comment.objects.exists()
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0, (
+        "Убедитесь, что счётчики комментариев обновляются при очистке."
+    )
+
+
+def test_interrupted_purge_can_resume(mixer, user):
+    mixer.cycle(3).blend("blog.Post", author=user)
+    progress = purge_user(user, chunk_size=1)
+    assert next(progress) == ("posts", 1)
+    progress.close()
+    user.refresh_from_db()
+    assert not user.is_active, (
+        "Убедитесь, что пользователь блокируется до начала удаления."
+    )
+    assert list(purge_user(user, chunk_size=5)) == [("posts", 2), ("user", 1)]
@@ -0,0 +1,284 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr("blog.backends.cache_is_shared", lambda: True)
+
+
+def _count_table_selects(queries, table):
+    return sum(
+        1 for query in queries
+        if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+    )
+
+
+def test_edit_comment_loads_comment_once(user_client, user, mixer):
+    post = mixer.blend("blog.Post", author=user)
+    comment = mixer.blend("blog.Comment", author=user, post=post)
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(
+            f"/posts/{post.id}/edit_comment/{comment.id}", {"text": "edited"}
+        )
+    assert response.status_code == 302
+    assert _count_table_selects(ctx.captured_queries, "blog_comment") == 1, (
+        "Убедитесь, что при редактировании комментария он загружается из"
+        " базы данных один раз."
+    )
+    assert _count_table_selects(ctx.captured_queries, "blog_post") == 0
+
+
+def test_delete_post_loads_post_once(user_client, user, mixer):
+    post = mixer.blend("blog.Post", author=user)
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get(f"/posts/{post.id}/delete/")
+    assert response.status_code == 200
+    assert _count_table_selects(ctx.captured_queries, "blog_post") == 1, (
+        "Убедитесь, что при удалении поста он загружается из базы данных"
+        " один раз."
+    )
+
+
+def test_post_excerpt_precomputed_on_save(mixer, user):
+    post = mixer.blend("blog.Post", author=user, text="слово " * 30)
+    assert post.excerpt == "слово " * 9 + "слово …"
+    post.text = "короткий текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "короткий текст", (
+        "Убедитесь, что анонс публикации пересчитывается при изменении текста."
+    )
+
+
+def test_feed_does_not_load_post_text(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/")
+    assert response.status_code == 200
+    post_queries = [
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert post_queries
+    assert all('"blog_post"."text"' not in sql for sql in post_queries), (
+        "Убедитесь, что лента не загружает полный текст публикаций."
+    )
+
+
+@pytest.fixture
+def forbid_deferred_loads(monkeypatch):
+    def refresh_from_db(self, using=None, fields=None):
+        raise AssertionError(
+            f"Шаблон обратился к отложенному полю {fields} модели"
+            f" `{type(self).__name__}`: добавьте его в проекцию ленты."
+        )
+
+    monkeypatch.setattr(Model, "refresh_from_db", refresh_from_db)
+
+
+@pytest.mark.parametrize("url_kind", ["index", "category", "profile"])
+def test_feed_templates_use_only_projected_fields(
+        url_kind, forbid_deferred_loads, user_client, user, mixer,
+        published_category, published_location):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+    )
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_kind]
+    response = user_client.get(url)
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == 3
+
+
+def test_logged_in_feed_skips_session_and_user_queries(user_client,
+                                                      shared_cache):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get("/")
+    assert response.status_code == 200
+    assert _count_table_selects(ctx.captured_queries, "django_session") == 0
+    assert _count_table_selects(ctx.captured_queries, "auth_user") == 0, (
+        "Убедитесь, что пользователь сессии берётся из кэша."
+    )
+
+
+def test_cached_user_invalidated_on_profile_edit(user_client, user,
+                                                shared_cache):
+    user_client.get("/")
+    response = user_client.post("/profile/edit/", {
+        "username": "renamed_user", "first_name": "Имя",
+        "last_name": "Фамилия", "email": "renamed@example.com",
+    })
+    assert response.status_code == 302
+    content = user_client.get("/").content.decode("utf-8")
+    assert "renamed_user" in content, (
+        "Убедитесь, что кэш пользователя сбрасывается после"
+        " редактирования профиля."
+    )
+
+
+def test_profile_timeline_skips_category_join(client, user, mixer):
+    category = mixer.blend("blog.Category", is_published=True)
+    post = mixer.blend("blog.Post", author=user, category=category,
+                       is_published=True)
+    assert post.is_visible
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/profile/{user.username}/")
+    assert post.title in response.content.decode("utf-8")
+    timeline = [
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert timeline and all(
+        '"blog_category"."is_published" = ' not in sql for sql in timeline
+    ), (
+        "Убедитесь, что лента автора фильтрует по денормализованному флагу"
+        " публикации категории."
+    )
+
+    category.is_published = False
+    category.save()
+    response = client.get(f"/profile/{user.username}/")
+    assert post.title not in response.content.decode("utf-8"), (
+        "Убедитесь, что снятие категории с публикации скрывает её посты"
+        " из профиля автора."
+    )
+
+
+def test_visibility_flag_follows_post_and_category(mixer, user):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from blog.models import Post
+    from blog.scheduler import promote_due_posts
+
+    category = mixer.blend("blog.Category", is_published=True)
+    future = timezone.now() + timedelta(days=1)
+    post = mixer.blend("blog.Post", author=user, category=category,
+                       is_published=True, pub_date=future)
+    assert not post.is_visible and post.pending_until == future, (
+        "Убедитесь, что отложенный пост ждёт публикации в pending_until."
+    )
+    assert not Post.objects.visible().filter(pk=post.pk).exists()
+    promote_due_posts(moment=future)
+    assert Post.objects.visible().filter(pk=post.pk).exists(), (
+        "Убедитесь, что пост с наступившей датой виден в лентах."
+    )
+
+    post.pub_date = timezone.now()
+    post.save()
+    category.is_published = False
+    category.save()
+    post.refresh_from_db()
+    assert not post.is_visible and post.pending_until is None, (
+        "Убедитесь, что снятие категории с публикации скрывает её посты."
+    )
+    category.is_published = True
+    category.save()
+    post.refresh_from_db()
+    assert post.is_visible
+
+
+def test_feed_filters_on_visibility_column(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/")
+    feed = [
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert feed and all('"blog_post"."is_visible"' in sql for sql in feed)
+    assert all('"blog_category"."is_published" =' not in sql
+               for sql in feed), (
+        "Убедитесь, что лента фильтрует по столбцу is_visible без условий"
+        " на таблицу категорий."
+    )
+
+
+def test_saving_deferred_post_skips_deferred_fields(mixer, user):
+    post = mixer.blend("blog.Post", author=user, text="исходный текст")
+    post = Post.objects.only("id", "title").get(pk=post.pk)
+    post.title = "Новый заголовок"
+    with CaptureQueriesContext(connection) as ctx:
+        post.save()
+    selects = _count_table_selects(ctx.captured_queries, "blog_post")
+    assert selects == 0, (
+        "Убедитесь, что сохранение поста с отложенными полями не"
+        " подгружает их из базы данных."
+    )
+    post.refresh_from_db()
+    assert post.title == "Новый заголовок"
+    assert post.text == "исходный текст"
+
+
+def test_sessions_of_plain_model_backend_stay_valid(client, user):
+    client.force_login(
+        user, backend="django.contrib.auth.backends.ModelBackend")
+    response = client.get("/profile/edit/")
+    assert response.status_code == 200, (
+        "Убедитесь, что сессии, открытые через ModelBackend, остаются"
+        " действительными."
+    )
+
+
+def test_cached_user_has_no_password_hash(user_client, user, shared_cache):
+    from django.core.cache import cache
+
+    from blog.backends import auth_user_cache_key
+
+    user_client.get("/")
+    cached = cache.get(auth_user_cache_key(user.pk))
+    assert cached is not None and "password" not in cached, (
+        "Убедитесь, что в кэше пользователя не хранится хэш пароля."
+    )
+
+
+def test_password_change_drops_cached_sessions(user_client, user,
+                                              shared_cache):
+    user_client.get("/")
+    user.set_password("новый-пароль-123")
+    user.save()
+    response = user_client.get("/profile/edit/")
+    assert response.status_code == 302, (
+        "Убедитесь, что после смены пароля старые сессии перестают"
+        " действовать."
+    )
+
+
+def test_password_change_keeps_own_session(user_client, user, shared_cache):
+    user.set_password("старый-пароль-123")
+    user.save()
+    user_client.force_login(user)
+    user_client.get("/")
+    response = user_client.post("/auth/password_change/", {
+        "old_password": "старый-пароль-123",
+        "new_password1": "новый-пароль-456",
+        "new_password2": "новый-пароль-456",
+    })
+    assert response.status_code == 302
+    response = user_client.get("/profile/edit/")
+    assert response.status_code == 200, (
+        "Убедитесь, что после смены пароля пользователь остаётся в своей"
+        " сессии."
+    )
+
+
+def test_auth_cache_disabled_for_process_local_cache(user_client, user):
+    from django.core.cache import cache
+
+    from blog.backends import auth_user_cache_key
+
+    user_client.get("/")
+    assert cache.get(auth_user_cache_key(user.pk)) is None, (
+        "Убедитесь, что пользователи не кэшируются в кэше процесса."
+    )
@@ -0,0 +1,56 @@
+import pytest
+from django.test import override_settings
+
+from blog.ratelimit import FixedWindowLimiter
+
+
+@pytest.mark.django_db
+def test_limiter_rejects_after_capacity():
+    limiter = FixedWindowLimiter()
+    results = [limiter.allow("test", capacity=3, period=60) for _ in range(4)]
+    assert results == [True, True, True, False], (
+        "Убедитесь, что лимитер отклоняет запросы сверх лимита окна."
+    )
+
+
+def test_limiter_falls_back_to_local_state(monkeypatch):
+    class BrokenCache:
+        def add(self, *args, **kwargs):
+            raise ConnectionRefusedError
+
+    monkeypatch.setattr(FixedWindowLimiter, "shared",
+                        property(lambda self: BrokenCache()))
+    limiter = FixedWindowLimiter()
+    results = [limiter.allow("test", capacity=2, period=60) for _ in range(3)]
+    assert results == [True, True, False], (
+        "Убедитесь, что при недоступном кэше лимит считается в процессе."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_flood_gets_429(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    with override_settings(RATELIMIT_ENABLED=True):
+        statuses = [
+            user_client.post(url, {"text": "спам"}).status_code
+            for _ in range(25)
+        ]
+    assert statuses[0] == 302
+    assert 429 in statuses, (
+        "Убедитесь, что при превышении лимита создания комментариев"
+        " возвращается статус 429."
+    )
+
+
+def test_client_ip_honours_trusted_proxies(rf, settings):
+    from blog.ratelimit import client_ip
+
+    request = rf.get("/", HTTP_X_FORWARDED_FOR="6.6.6.6, 1.2.3.4",
+                     REMOTE_ADDR="10.0.0.1")
+    settings.RATELIMIT_TRUSTED_PROXIES = 0
+    assert client_ip(request) == "10.0.0.1"
+    settings.RATELIMIT_TRUSTED_PROXIES = 1
+    assert client_ip(request) == "1.2.3.4", (
+        "Убедитесь, что за прокси адрес клиента берётся из X-Forwarded-For"
+        " без доверия подставленным клиентом адресам."
+    )
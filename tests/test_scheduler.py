@@ -0,0 +1,48 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Lease, Post
+from blog.scheduler import LEASE_NAME, promote_due_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduler_promotes_due_posts_once(mixer, user):
+    category = mixer.blend("blog.Category", is_published=True)
+    future = timezone.now() + timedelta(hours=1)
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=category, is_published=True,
+        pub_date=future)
+    assert promote_due_posts(batch_size=2) == 0
+    assert promote_due_posts(batch_size=2, moment=future) == 3
+    assert promote_due_posts(batch_size=2, moment=future) == 0, (
+        "Убедитесь, что пост переключается планировщиком только один раз."
+    )
+    assert Post.objects.filter(
+        pk__in=[post.pk for post in posts], is_visible=True,
+        pending_until__isnull=True
+    ).count() == 3
+
+
+def test_publish_scheduled_respects_lease(mixer, user):
+    lease = Lease.objects.create(
+        name=LEASE_NAME, token="other-worker",
+        expires_at=timezone.now() + timedelta(minutes=1))
+    out = StringIO()
+    call_command("publish_scheduled", stdout=out)
+    assert "другой обработчик" in out.getvalue(), (
+        "Убедитесь, что одновременно проход выполняет только один"
+        " обработчик."
+    )
+    lease.expires_at = timezone.now()
+    lease.save()
+    out = StringIO()
+    call_command("publish_scheduled", stdout=out)
+    assert "Опубликовано постов: 0" in out.getvalue(), (
+        "Убедитесь, что просроченную аренду забирает новый обработчик."
+    )
+    assert not Lease.objects.exists()
@@ -0,0 +1,58 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_delete_is_soft(user_client, user, mixer):
+    post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(3).blend("blog.Comment", author=user, post=post)
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302
+    assert not any(query["sql"].startswith("DELETE")
+                   for query in ctx.captured_queries), (
+        "Убедитесь, что удаление поста в запросе только помечает его"
+        " удалённым."
+    )
+    assert not Post.objects.filter(pk=post.pk).exists()
+    deleted = Post.all_objects.get(pk=post.pk)
+    assert deleted.deleted_at is not None and not deleted.is_visible
+    assert Comment.all_objects.filter(post_id=post.pk).count() == 3
+    assert user_client.get(f"/posts/{post.id}/").status_code == 404
+
+
+def test_comment_soft_delete_updates_counter(user_client, user, mixer):
+    post = mixer.blend("blog.Post", author=user)
+    comment = mixer.blend("blog.Comment", author=user, post=post)
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что мягко удалённый комментарий вычитается из счётчика."
+    )
+    assert Comment.all_objects.filter(pk=comment.pk).exists()
+
+
+def test_purge_deleted_removes_flagged_rows(user, mixer):
+    kept = mixer.blend("blog.Post", author=user)
+    post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(2).blend("blog.Comment", author=user, post=post)
+    comment = mixer.blend("blog.Comment", author=user, post=kept)
+    comment.soft_delete()
+    post.soft_delete()
+    out = StringIO()
+    call_command("purge_deleted", "--older-than", "0", stdout=out)
+    assert out.getvalue().splitlines() == [
+        "Удалено комментариев: 1", "Удалено постов: 1"]
+    assert list(Post.all_objects.all()) == [kept]
+    assert not Comment.all_objects.exists(), (
+        "Убедитесь, что очистка удаляет помеченные строки и их комментарии."
+    )
+    kept.refresh_from_db()
+    assert kept.comment_count == 0
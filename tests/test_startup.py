@@ -0,0 +1,36 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.startup import group_by_package, parse_importtime
+
+
+def test_parse_importtime():
+    modules = parse_importtime([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        300 |   blog.cache",
+        "import time:        80 |        500 | blog",
+        "import time:        50 |         50 | django.urls",
+    ])
+    assert modules == [
+        ("blog.cache", 120, 300), ("blog", 80, 500), ("django.urls", 50, 50)]
+    assert group_by_package(modules) == [("blog", 200), ("django", 50)], (
+        "Убедитесь, что время импорта суммируется по пакетам."
+    )
+
+
+def test_startupprofile_reports_phases():
+    out = StringIO()
+    call_command("startupprofile", "--top", "3", stdout=out)
+    output = out.getvalue()
+    for phase in ("apps_ready", "urlconf", "middleware", "templates"):
+        assert phase in output, (
+            f"Убедитесь, что профиль запуска показывает этап {phase}."
+        )
+    assert "django\t" in output
+
+
+def test_preforkserver_requires_shared_cache():
+    with pytest.raises(CommandError, match="BLOGICUM_CACHE"):
+        call_command("preforkserver", "--workers", "1")
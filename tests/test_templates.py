@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+from blog.benchmarks import (
+    django_engine, feed_contexts, jinja2_engine, measure,
+    sample_posts, sample_request)
+
+
+@pytest.mark.django_db
+def test_production_profile_renders_same_index():
+    path, context = feed_contexts()["blog/index.html"]
+    request = sample_request(path)
+    results = {
+        profile: measure(
+            lambda: django_engine(profile), "blog/index.html",
+            context, request, renders=3,
+        )
+        for profile in ("debug", "production")
+    }
+    assert results["debug"]["html"] == results["production"]["html"], (
+        "Убедитесь, что производственный профиль шаблонов не меняет"
+        " итоговую разметку."
+    )
+    assert results["production"]["html"].count('class="card-title"') == 10
+    for result in results.values():
+        assert result["parse"] > 0 and result["render"] > 0
+
+
+def _normalize_html(html):
+    html = re.sub(r'name="csrfmiddlewaretoken" value="[^"]*"', "", html)
+    html = re.sub(r"\s+", " ", html)
+    return re.sub(r">\s+<", "><", html).strip()
+
+
+@pytest.mark.parametrize("authenticated", [False, True])
+@pytest.mark.parametrize("template_name", [
+    "blog/index.html", "blog/category.html",
+    "blog/profile.html", "blog/detail.html",
+])
+def test_jinja2_templates_match_django(template_name, authenticated):
+    pytest.importorskip("jinja2")
+    path, context = feed_contexts()[template_name]
+    request = sample_request(path)
+    if authenticated:
+        request.user = sample_posts(1)[0].author
+    django_html = django_engine("debug").get_template(template_name).render(
+        context, request)
+    jinja2_html = jinja2_engine().get_template(template_name).render(
+        context, request)
+    assert _normalize_html(django_html) == _normalize_html(jinja2_html), (
+        f"Убедитесь, что Jinja2-версия шаблона `{template_name}` выдаёт ту же"
+        " разметку, что и шаблон Django."
+    )